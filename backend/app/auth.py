@@ -1,16 +1,36 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from typing import Optional
-import requests
+import time
 
+from .cache import TTLCache
 from .config import settings
-from .models.database import get_db
+from .models.database import get_async_db
 from .models.user import User
+from .services.google_clients import google_clients
 
 security = HTTPBearer()
 
+# Hot-path caches: a cache hit authenticates a request without decoding the
+# JWT or touching the database. Cached users are detached, read-only copies;
+# handlers that modify the user must use load_user_for_update().
+token_cache = TTLCache("auth_tokens", settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+user_cache = TTLCache("auth_users", settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user row; call after any change to the user"""
+    user_cache.pop(user_id)
+    # Google tokens may have changed; pooled clients would keep using the old ones
+    google_clients.evict_user(user_id)
+
+async def load_user_for_update(db: AsyncSession, user_id: int) -> User:
+    """Fresh, session-bound copy of a user for handlers that modify it"""
+    invalidate_user(user_id)
+    return await db.get(User, user_id, populate_existing=True)
+
 def create_access_token(data: dict) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -35,13 +55,16 @@ async def verify_token(token: str) -> dict:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Get current authenticated user"""
     token = credentials.credentials
     
-    # Verify token
-    payload = await verify_token(token)
+    # Verify token (decoded payloads are cached until they expire)
+    payload = token_cache.get(token)
+    if payload is None or payload.get("exp", float("inf")) < time.time():
+        payload = await verify_token(token)
+        token_cache.set(token, payload)
     user_id: str = payload.get("sub")
     
     if user_id is None:
@@ -54,10 +77,15 @@ async def get_current_user(
     # Get user from database (now using integer ID)
     try:
         user_id_int = int(user_id)
-        user = db.query(User).filter(User.id == user_id_int).first()
+        user = user_cache.get(user_id_int)
+        if user is None:
+            user = await db.get(User, user_id_int)
+            if user is not None:
+                user_cache.set(user_id_int, user)
     except ValueError:
         # Fallback to supabase_user_id if it's not an integer
-        user = db.query(User).filter(User.supabase_user_id == user_id).first()
+        result = await db.execute(select(User).where(User.supabase_user_id == user_id))
+        user = result.scalars().first()
     
     if user is None:
         raise HTTPException(
@@ -70,7 +98,7 @@ async def get_current_user(
 
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Optional[User]:
     """Get current authenticated user (optional)"""
     if not credentials:
@@ -23,6 +23,41 @@ class Settings:
     google_client_secret: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
     google_redirect_uri: str = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:3000/auth/callback")
     
+    # Google Calendar outbox worker (calendar changes are applied in the background)
+    calendar_outbox_enabled: bool = os.getenv("CALENDAR_OUTBOX_ENABLED", "true").lower() == "true"
+    calendar_outbox_workers: int = int(os.getenv("CALENDAR_OUTBOX_WORKERS", "4"))
+    calendar_outbox_poll_seconds: float = float(os.getenv("CALENDAR_OUTBOX_POLL_SECONDS", "2"))
+    calendar_outbox_max_attempts: int = int(os.getenv("CALENDAR_OUTBOX_MAX_ATTEMPTS", "8"))
+    # Override the Calendar API root, e.g. http://localhost:8090/calendar/v3/ for fake_calendar_server.py
+    google_calendar_api_endpoint: str = os.getenv("GOOGLE_CALENDAR_API_ENDPOINT", "")
+    
+    # Pooled Google API clients (per user, reused across requests)
+    google_client_pool_per_user: int = int(os.getenv("GOOGLE_CLIENT_POOL_PER_USER", "4"))
+    google_client_pool_max_users: int = int(os.getenv("GOOGLE_CLIENT_POOL_MAX_USERS", "1000"))
+    
+    # Google Drive file metadata cache (memory and drive_file_cache table)
+    drive_cache_ttl_seconds: int = int(os.getenv("DRIVE_CACHE_TTL_SECONDS", "3600"))
+    drive_cache_max_entries: int = int(os.getenv("DRIVE_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Anonymous public notes feed: server-side cache and Cache-Control max-age
+    public_notes_cache_ttl_seconds: int = int(os.getenv("PUBLIC_NOTES_CACHE_TTL_SECONDS", "30"))
+    public_notes_cache_max_entries: int = int(os.getenv("PUBLIC_NOTES_CACHE_MAX_ENTRIES", "1000"))
+    
+    # Per-user academic year (most common class year), used for new notes
+    academic_year_cache_ttl_seconds: int = int(os.getenv("ACADEMIC_YEAR_CACHE_TTL_SECONDS", "3600"))
+    academic_year_cache_max_entries: int = int(os.getenv("ACADEMIC_YEAR_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Per-user "now / next" slot index over the active schedule
+    schedule_index_ttl_seconds: int = int(os.getenv("SCHEDULE_INDEX_TTL_SECONDS", "600"))
+    schedule_index_max_entries: int = int(os.getenv("SCHEDULE_INDEX_MAX_ENTRIES", "10000"))
+    
+    # Authenticated-user cache (decoded tokens and user rows)
+    auth_cache_ttl_seconds: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    auth_cache_max_entries: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+    
+    # Diagnostics: warn when one statement runs more than this many times in a request
+    sql_repeat_warn_threshold: int = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "10"))
+    
     def __post_init__(self):
         # Warn about insecure JWT secret key
         if self.jwt_secret_key in [
@@ -0,0 +1,108 @@
+from fastapi import Depends, Request, Response
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from typing import Callable, Iterable
+import hashlib
+
+from .models.database import get_db
+from .models.schedule import Schedule
+from .models.sync_change import SyncChange, SyncEntity
+from .models.user import User
+from .auth import get_current_user
+from .timezones import local_now, utc_minute
+
+# Conditional GET for user data. A collection's version is the latest seq
+# of its entity in the user's sync change log (see services/sync_changes),
+# which every write to homework, classes, notes and schedules bumps in the
+# same transaction. The ETag hashes the versions of the collections a
+# response is built from with the request, so checking it costs one query
+# and a match never runs the endpoint's queries.
+
+class NotModified(Exception):
+    """Raised by the ETag dependencies; answered with a bodyless 304 (see main.py)"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+def not_modified_response(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"})
+
+def _check(request: Request, response: Response, *parts) -> None:
+    """Raise NotModified if If-None-Match has the ETag for `parts`, else set it on the response"""
+    key = "|".join(map(str, parts + (request.url.path, sorted(request.query_params.multi_items()))))
+    etag = 'W/"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+    # Weak comparison: W/ prefixes don't matter
+    tags = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    # Browsers revalidate on every use, so clients get this for free
+    response.headers["Cache-Control"] = "private, no-cache"
+
+def user_version(db: Session, user_id, entities: Iterable[SyncEntity]) -> tuple:
+    """Latest change seq of each of `entities` for one user (None: no changes yet).
+
+    One query; each max is a seek on ix_sync_changes_user_entity_seq.
+    """
+    return tuple(db.execute(select(*(
+        select(func.max(SyncChange.seq)).where(SyncChange.user_id == user_id, SyncChange.entity == entity)
+        .scalar_subquery()
+        for entity in entities
+    ))).one())
+
+def _user_parts(db: Session, user: User, entities) -> tuple:
+    return user.id, user_version(db, user.id, entities), user.updated_at, local_now(user.get_timezone()).date()
+
+def user_etag(*entities: SyncEntity) -> Callable:
+    """Dependency for endpoints returning the current user's `entities`.
+
+    Writes to the user's other collections leave the tag alone. The user's
+    local date is part of the tag, since what is due today changes at
+    midnight without any write.
+    """
+    def check(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ) -> None:
+        _check(request, response, *_user_parts(db, current_user, entities))
+    return check
+
+def user_due_etag(*entities: SyncEntity) -> Callable:
+    """user_etag for endpoints that split homework at the current time (e.g. overdue).
+
+    Adds the current UTC minute, so the tag changes as soon as an item can
+    have become overdue without querying homework. The endpoints compare
+    due times against utc_minute(), so a response is a function of its tag
+    and goes stale by at most a minute.
+    """
+    def check(
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ) -> None:
+        _check(request, response, *_user_parts(db, current_user, entities), utc_minute())
+    return check
+
+# Homework responses embed their class
+homework_etag = user_etag(SyncEntity.HOMEWORK, SyncEntity.CLASS)
+homework_due_etag = user_due_etag(SyncEntity.HOMEWORK, SyncEntity.CLASS)
+class_etag = user_etag(SyncEntity.CLASS)
+note_etag = user_etag(SyncEntity.NOTE)
+
+def schedule_etag(schedule_id: int, request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+    """For endpoints returning one schedule, versioned by its owner's schedule, slot and class changes"""
+    owner_id = select(Schedule.user_id).where(Schedule.id == schedule_id).scalar_subquery()
+    version = user_version(db, owner_id, (SyncEntity.SCHEDULE, SyncEntity.SCHEDULE_SLOT, SyncEntity.CLASS))
+    _check(request, response, schedule_id, version)
+
+def global_etag(request: Request, response: Response, db: Session = Depends(get_db)) -> None:
+    """For endpoints listing every user's data (e.g. all schedules).
+
+    Versioned by the latest change of any kind by anyone (one seek on the
+    primary key), so unrelated writes also change the tag.
+    """
+    _check(request, response, db.scalar(select(func.max(SyncChange.seq))) or 0)
@@ -1,13 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.routing import APIRoute
+import inspect
 import os
 
-from .models.database import engine, Base
-from .routers import classes, schedules, homework, dashboard, auth, calendar, notes
+from .models.database import engine, async_engine, get_db, run_migrations
+from .middleware import QueryStatsMiddleware
+from .cache import cache_stats
+from .config import settings
+from .etags import NotModified, not_modified_response
+from .services.calendar_outbox import calendar_outbox_worker
+from .routers import classes, schedules, homework, dashboard, auth, calendar, notes, sync
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Create/upgrade database tables (see backend/migrations)
+run_migrations()
 
 app = FastAPI(
     title="Homework Management API",
@@ -22,8 +29,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-DB-Queries", "Server-Timing", "ETag"],
 )
 
+# Per-request SQL statement counts and N+1 warnings
+app.add_middleware(QueryStatsMiddleware, engines=[engine, async_engine.sync_engine])
+
+# ETag dependencies answer a matching If-None-Match with 304 (see etags.py)
+app.add_exception_handler(NotModified, not_modified_response)
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(calendar.router, prefix="/api")
@@ -32,6 +46,39 @@ app.include_router(schedules.router, prefix="/api")
 app.include_router(homework.router, prefix="/api")
 app.include_router(notes.router, prefix="/api")
 app.include_router(dashboard.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+
+def _find_blocking_db_usage(dependant, path=()):
+    """Yield call chains where an `async def` callable receives a sync Session"""
+    for sub in dependant.dependencies:
+        if sub.call is get_db and inspect.iscoroutinefunction(dependant.call):
+            yield path + (dependant.call.__name__,)
+        yield from _find_blocking_db_usage(sub, path + (dependant.call.__name__,))
+
+def check_async_handlers_use_async_db(routes):
+    """Fail fast if an async handler or dependency would run sync queries on the event loop.
+
+    Sync (`def`) handlers using get_db are fine: FastAPI runs them in the threadpool.
+    """
+    offenders = []
+    for route in routes:
+        if isinstance(route, APIRoute):
+            offenders += [" -> ".join(chain) for chain in _find_blocking_db_usage(route.dependant)]
+    if offenders:
+        raise RuntimeError(
+            "async handlers must use get_async_db, not get_db: " + ", ".join(offenders)
+        )
+
+check_async_handlers_use_async_db(app.routes)
+
+@app.on_event("startup")
+def start_calendar_outbox_worker():
+    if settings.calendar_outbox_enabled:
+        calendar_outbox_worker.start()
+
+@app.on_event("shutdown")
+def stop_calendar_outbox_worker():
+    calendar_outbox_worker.stop()
 
 @app.get("/")
 async def root():
@@ -41,6 +88,11 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/cache")
+async def cache_health():
+    """Hit/miss counters for the in-process caches"""
+    return cache_stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,99 @@
+from contextvars import ContextVar
+from collections import Counter
+from typing import Optional, Sequence
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+import time
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+class RequestQueryStats:
+    """SQL statements executed while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.statements = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        """Parameterized statements run more than `threshold` times (likely N+1 patterns)"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count > threshold]
+
+# Set by QueryStatsMiddleware for the duration of a request. Sync endpoints run
+# in the threadpool with a copy of the context, so they share the same object.
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if start_times:
+        stats.record(statement, time.perf_counter() - start_times.pop())
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; count it and drop its start time
+    stats = _current_stats.get()
+    conn = exception_context.connection
+    if stats is None or conn is None or exception_context.statement is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if start_times:
+        stats.record(exception_context.statement, time.perf_counter() - start_times.pop())
+
+def install_query_hooks(engine: Engine):
+    """Attach the per-request statement counters to an engine (idempotent)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+class QueryStatsMiddleware:
+    """Count SQL statements and DB time per request.
+
+    Adds `X-DB-Queries` and `Server-Timing: db;dur=...` response headers and
+    logs a warning when the same parameterized statement runs more than
+    `settings.sql_repeat_warn_threshold` times in one request.
+    """
+
+    def __init__(self, app, engines: Sequence[Engine]):
+        self.app = app
+        for engine in engines:
+            install_query_hooks(engine)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"server-timing", f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            for statement, count in stats.repeated(settings.sql_repeat_warn_threshold):
+                logger.warning(
+                    f"Possible N+1: statement executed {count} times in {scope['method']} {scope['path']}: {statement}"
+                )
@@ -4,5 +4,10 @@ from .classes import Class
 from .schedule import Schedule, ScheduleSlot
 from .homework import Homework
 from .notes import Note
+from .user_stats import UserStats
+from .calendar_outbox import CalendarOutbox
+from .drive_file_cache import DriveFileCache
+from .note_facets import PublicNoteFacet
+from .sync_change import SyncChange
 
-__all__ = ["Base", "engine", "SessionLocal", "User", "Class", "Schedule", "ScheduleSlot", "Homework", "Note"]
\ No newline at end of file
+__all__ = ["Base", "engine", "SessionLocal", "User", "Class", "Schedule", "ScheduleSlot", "Homework", "Note", "UserStats", "CalendarOutbox", "DriveFileCache", "PublicNoteFacet", "SyncChange"]
\ No newline at end of file
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from enum import Enum as PyEnum
+from .database import Base
+
+class OutboxOperation(PyEnum):
+    CREATE = "CREATE"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+class OutboxStatus(PyEnum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    FAILED = "FAILED"  # Gave up after max attempts
+
+class CalendarOutbox(Base):
+    """Google Calendar side effect recorded in the same transaction as the homework change"""
+    __tablename__ = "calendar_outbox"
+    __table_args__ = (
+        # Worker scan: oldest open entry per user
+        Index("ix_calendar_outbox_status_user", "status", "user_id", "id"),
+        Index("ix_calendar_outbox_homework", "homework_id", "operation"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    homework_id = Column(Integer, nullable=True)  # No FK: the homework may be deleted before the entry is processed
+    operation = Column(Enum(OutboxOperation), nullable=False)
+
+    # Set on DELETE entries at enqueue time, and on CREATE entries once the event exists
+    event_id = Column(String(100), nullable=True)
+
+    status = Column(Enum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<CalendarOutbox(id={self.id}, op='{self.operation}', homework={self.homework_id}, status='{self.status}')>"
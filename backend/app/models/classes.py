@@ -25,7 +25,7 @@ class Class(Base):
     __tablename__ = "classes"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     teacher = Column(String(100), nullable=False)
     year = Column(String(20), nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from datetime import datetime
+from .database import Base
+
+class DriveFileCache(Base):
+    """Drive file metadata as last seen by a user, so attaching a file can skip the Drive API"""
+    __tablename__ = "drive_file_cache"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    file_id = Column(String(100), primary_key=True)
+
+    accessible = Column(Boolean, nullable=False, default=True)  # False: the user got 403/404 for this file
+    name = Column(String(255), nullable=True)
+    mime_type = Column(String(100), nullable=True)
+    web_view_link = Column(String(500), nullable=True)
+    is_public = Column(Boolean, nullable=True)  # Has an "anyone with the link" reader permission; NULL if unknown
+
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DriveFileCache(user_id={self.user_id}, file_id='{self.file_id}', accessible={self.accessible})>"
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Date, Time, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Date, Time, Enum, Index, event, inspect, select
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.orm.util import identity_key
 from datetime import datetime, date, time
 from enum import Enum as PyEnum
 from .database import Base
+from .user import User
+from ..timezones import to_utc
 
 class Priority(PyEnum):
     LOW = "LOW"
@@ -16,6 +19,13 @@ class Status(PyEnum):
 
 class Homework(Base):
     __tablename__ = "homework"
+    __table_args__ = (
+        Index("ix_homework_user_status_due", "user_id", "status", "due_date"),
+        Index("ix_homework_user_class", "user_id", "class_id"),
+        Index("ix_homework_user_due", "user_id", "due_date", "due_time", "id"),
+        Index("ix_homework_user_updated", "user_id", "updated_at", "id"),
+        Index("ix_homework_user_due_at", "user_id", "due_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     class_id = Column(Integer, ForeignKey("classes.id"), nullable=False)
@@ -26,6 +36,7 @@ class Homework(Base):
     assigned_date = Column(Date, nullable=False, default=date.today)
     due_date = Column(Date, nullable=False)
     due_time = Column(Time, nullable=False, default=time(23, 59))  # Default to 23:59
+    due_at = Column(DateTime, nullable=True)  # due_date + due_time in the user's timezone, as UTC (set on flush)
     
     priority = Column(Enum(Priority), default=Priority.MEDIUM)
     status = Column(Enum(Status), default=Status.PENDING)
@@ -42,4 +53,38 @@ class Homework(Base):
     user = relationship("User", back_populates="homework")
     
     def __repr__(self):
-        return f"<Homework(title='{self.title}', class='{self.class_.name if self.class_ else 'N/A'}', due='{self.due_date}')>"
\ No newline at end of file
+        return f"<Homework(title='{self.title}', class='{self.class_.name if self.class_ else 'N/A'}', due='{self.due_date}')>"
+
+@event.listens_for(Session, "before_flush")
+def _set_due_at(session, flush_context, instances):
+    """Keep due_at in step with due_date/due_time for every ORM write.
+
+    Timezones come from users already in the session, and the rest are
+    looked up in one query per flush. Writes that bypass the ORM (bulk
+    INSERT/UPDATE statements) must set due_at themselves with to_utc().
+    """
+    targets = [obj for obj in session.new if isinstance(obj, Homework)]
+    for obj in session.dirty:
+        if not isinstance(obj, Homework):
+            continue
+        state = inspect(obj)
+        if obj.due_at is None or state.attrs.due_date.history.has_changes() or state.attrs.due_time.history.has_changes():
+            targets.append(obj)
+    if not targets:
+        return
+
+    def loaded_user(obj):
+        # The related user if it's in memory with its timezone loaded (no lazy loads)
+        user = obj.__dict__.get("user") or session.identity_map.get(identity_key(User, obj.user_id))
+        return user if user is not None and "timezone" in user.__dict__ else None
+
+    timezones = {}
+    missing = {obj.user_id for obj in targets if loaded_user(obj) is None}
+    if missing:
+        with session.no_autoflush:
+            timezones = dict(session.execute(select(User.id, User.timezone).where(User.id.in_(missing))).all())
+
+    for obj in targets:
+        user = loaded_user(obj)
+        timezone_name = user.timezone if user is not None else timezones.get(obj.user_id)
+        obj.due_at = to_utc(obj.due_date, obj.due_time or time(23, 59), timezone_name)
@@ -0,0 +1,44 @@
+from sqlalchemy.orm import joinedload, selectinload, noload
+
+from .classes import Class
+from .homework import Homework
+from .schedule import Schedule, ScheduleSlot
+
+# Eager-loading strategies for list endpoints. Response schemas nest
+# class_ -> user and user, so without these every row triggers lazy
+# SELECTs while Pydantic reads the attributes. "slim" variants skip the
+# nested user objects entirely (serialized as null).
+
+def homework_options(slim: bool = False):
+    """Loader options for queries returning schemas.Homework"""
+    if slim:
+        return (
+            joinedload(Homework.class_).noload(Class.user),
+            noload(Homework.user),
+        )
+    return (
+        joinedload(Homework.class_).joinedload(Class.user),
+        joinedload(Homework.user),
+    )
+
+def class_options(slim: bool = False):
+    """Loader options for queries returning schemas.Class"""
+    if slim:
+        return (noload(Class.user),)
+    return (joinedload(Class.user),)
+
+def schedule_options(slim: bool = False):
+    """Loader options for queries returning schemas.Schedule"""
+    if slim:
+        return (noload(Schedule.user),)
+    return (joinedload(Schedule.user),)
+
+def schedule_slot_options(slim: bool = False):
+    """Loader options for queries returning schemas.ScheduleSlot"""
+    return (joinedload(ScheduleSlot.class_).options(*class_options(slim)),)
+
+def schedule_with_slots_options(slim: bool = False):
+    """Loader options for queries returning schemas.ScheduleWithSlots"""
+    return schedule_options(slim) + (
+        selectinload(Schedule.slots).joinedload(ScheduleSlot.class_).options(*class_options(slim)),
+    )
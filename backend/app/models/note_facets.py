@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, PrimaryKeyConstraint
+from .database import Base
+
+class PublicNoteFacet(Base):
+    __tablename__ = "public_note_facets"
+    __table_args__ = (
+        PrimaryKeyConstraint("class_type", "education_level", "year", "school"),
+    )
+
+    # Number of public notes per combination of the browse filters, kept up to
+    # date by the note write handlers. A missing education level or school is
+    # stored as '' so every combination has exactly one row.
+    class_type = Column(String(50), nullable=False)
+    education_level = Column(String(20), nullable=False, default="")
+    year = Column(String(20), nullable=False)
+    school = Column(String(200), nullable=False, default="")
+    note_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PublicNoteFacet(class_type='{self.class_type}', year='{self.year}', school='{self.school}', count={self.note_count})>"
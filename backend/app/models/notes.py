@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from enum import Enum as PyEnum
@@ -20,8 +20,18 @@ class EducationLevel(PyEnum):
     GRADE_11 = "GRADE_11"
     GRADE_12 = "GRADE_12"
 
+class DriveStatus(PyEnum):
+    PENDING = "PENDING"  # Drive file metadata/sharing is being resolved in the background
+    READY = "READY"
+    FAILED = "FAILED"    # File not accessible, or Drive kept failing
+
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_public_type_updated", "is_public", "class_type", "updated_at"),
+        Index("ix_notes_user_updated", "user_id", "updated_at"),
+        Index("ix_notes_public_updated", "is_public", "updated_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -38,6 +48,7 @@ class Note(Base):
     google_drive_file_url = Column(String(500), nullable=True)  # Direct link to the file
     google_drive_file_name = Column(String(255), nullable=True)  # Original file name
     google_drive_mime_type = Column(String(100), nullable=True)  # File MIME type
+    drive_status = Column(Enum(DriveStatus), nullable=True)  # NULL when no Drive file is attached
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
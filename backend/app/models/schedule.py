@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Time, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Time, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, time
 from enum import Enum as PyEnum
@@ -18,6 +18,9 @@ class SlotType(PyEnum):
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        Index("ix_schedules_year_active", "year", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -36,6 +39,9 @@ class Schedule(Base):
 
 class ScheduleSlot(Base):
     __tablename__ = "schedule_slots"
+    __table_args__ = (
+        Index("ix_schedule_slots_schedule_day_slot", "schedule_id", "day", "slot_number", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     schedule_id = Column(Integer, ForeignKey("schedules.id"), nullable=False)
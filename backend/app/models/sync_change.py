@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, Enum, Index
+from datetime import datetime
+from enum import Enum as PyEnum
+from .database import Base
+
+class SyncEntity(PyEnum):
+    HOMEWORK = "HOMEWORK"
+    CLASS = "CLASS"
+    NOTE = "NOTE"
+    SCHEDULE_SLOT = "SCHEDULE_SLOT"
+    SCHEDULE = "SCHEDULE"
+
+class SyncChange(Base):
+    """Latest change to one synced record; `seq` orders a user's changes for delta sync.
+
+    Compacted: each record has at most one row, replaced (with a new seq)
+    whenever it changes again. Deleted records keep a tombstone row.
+    """
+    __tablename__ = "sync_changes"
+    __table_args__ = (
+        Index("ix_sync_changes_user_seq", "user_id", "seq"),
+        Index("ix_sync_changes_user_entity_seq", "user_id", "entity", "seq"),
+        Index("ix_sync_changes_entity", "entity", "entity_id"),
+        # Never reuse a seq (SQLite would hand out max(seq) + 1 again after compaction)
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(Enum(SyncEntity), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncChange(seq={self.seq}, entity='{self.entity}', id={self.entity_id}, deleted={self.deleted})>"
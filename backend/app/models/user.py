@@ -30,6 +30,7 @@ class User(Base):
     schedules = relationship("Schedule", back_populates="user")
     homework = relationship("Homework", back_populates="user")
     notes = relationship("Note", back_populates="user")
+    stats = relationship("UserStats", back_populates="user", uselist=False)
     
     def get_timezone(self):
         """Get user's timezone, defaulting to UTC if not set"""
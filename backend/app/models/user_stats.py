@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .database import Base
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+
+    # One row per user, kept up to date by the homework write handlers
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_homework = Column(Integer, nullable=False, default=0)
+    pending_homework = Column(Integer, nullable=False, default=0)  # Any status other than COMPLETED
+    completed_homework = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User", back_populates="stats")
+
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, pending={self.pending_homework}, completed={self.completed_homework})>"
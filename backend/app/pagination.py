@@ -0,0 +1,80 @@
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_
+from datetime import datetime, date, time
+from typing import Dict, List, Optional, Sequence, Tuple
+import base64
+import json
+
+# Response header carrying the cursor for the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# A sort order is a sequence of (column, descending) pairs ending in a unique column
+SortOrder = Sequence[Tuple[object, bool]]
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(sort_key: str, values: Sequence) -> str:
+    """Build an opaque cursor token from the sort key values of the last row"""
+    payload = json.dumps({"s": sort_key, "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, sort_key: str, order: SortOrder) -> List:
+    """Decode a cursor token, checking it was issued for the same sort order"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_key or len(payload["v"]) != len(order):
+            raise ValueError("cursor does not match sort order")
+        return [_decode_value(column, value) for (column, _), value in zip(order, payload["v"])]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def keyset_condition(order: SortOrder, values: Sequence):
+    """Rows strictly after `values` in `order`: (a > x) OR (a = x AND b > y) OR ..."""
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal = [col == value for (col, _), value in zip(order[:i], values[:i])]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+def paginate(
+    query,
+    sorts: Dict[str, SortOrder],
+    sort_key: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> list:
+    """Apply a deterministic sort plus keyset (cursor) or legacy offset pagination.
+
+    Sets the next-page cursor header when the page is full.
+    """
+    order = sorts[sort_key]
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+
+    if cursor:
+        query = query.filter(keyset_condition(order, decode_cursor(cursor, sort_key, order)))
+    elif skip:
+        query = query.offset(skip)
+
+    items = query.limit(limit).all()
+
+    if items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            sort_key, [getattr(last, column.key) for column, _ in order]
+        )
+    return items
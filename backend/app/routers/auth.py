@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
-import requests
+import httpx
 import logging
 import traceback
 
-from ..models.database import get_db
+from ..models.database import get_async_db
 from ..models.user import User
-from ..auth import get_current_user, get_current_user_optional, create_access_token
+from ..auth import get_current_user, get_current_user_optional, create_access_token, invalidate_user, load_user_for_update
 from .. import schemas
 from ..config import settings
+from ..services.due_at import recompute_due_at
 
 logger = logging.getLogger(__name__)
 
@@ -40,21 +43,27 @@ class LoginResponse(BaseModel):
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Simple login endpoint - creates or updates user"""
+    async def update_existing(user: User):
+        user.full_name = login_data.full_name
+        if login_data.google_access_token:
+            user.google_access_token = login_data.google_access_token
+            user.google_refresh_token = login_data.google_refresh_token
+        if login_data.timezone and login_data.timezone != user.timezone:
+            user.timezone = login_data.timezone
+            # Stored due times are UTC instants of the local due date and time
+            await db.run_sync(recompute_due_at, user.id, user.timezone)
+    
     try:
         # Check if user exists
-        user = db.query(User).filter(User.email == login_data.email).first()
+        result = await db.execute(select(User).where(User.email == login_data.email))
+        user = result.scalars().first()
         
         if user:
             # Update existing user
-            user.full_name = login_data.full_name
-            if login_data.google_access_token:
-                user.google_access_token = login_data.google_access_token
-                user.google_refresh_token = login_data.google_refresh_token
-            if login_data.timezone:
-                user.timezone = login_data.timezone
+            await update_existing(user)
         else:
             # Create new user
             user = User(
@@ -68,8 +77,17 @@ async def login(
             )
             db.add(user)
         
-        db.commit()
-        db.refresh(user)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent first login created the same user; update that row instead
+            await db.rollback()
+            result = await db.execute(select(User).where(User.email == login_data.email))
+            user = result.scalars().one()
+            await update_existing(user)
+            await db.commit()
+        await db.refresh(user)
+        invalidate_user(user.id)
         
         # Create access token
         access_token = create_access_token(data={"sub": str(user.id)})
@@ -93,18 +111,18 @@ async def login(
 async def google_auth_callback(
     token_data: GoogleTokenRequest,
     supabase_user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle Google OAuth callback and create/update user"""
     try:
         # Get user info from Google if we have access token
         google_user = {}
         if token_data.access_token:
-            response = requests.get(
-                "https://www.googleapis.com/oauth2/v1/userinfo",
-                headers={"Authorization": f"Bearer {token_data.access_token}"},
-                timeout=10  # Add timeout
-            )
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(
+                    "https://www.googleapis.com/oauth2/v1/userinfo",
+                    headers={"Authorization": f"Bearer {token_data.access_token}"}
+                )
             
             if response.status_code == 200:
                 google_user = response.json()
@@ -112,9 +130,10 @@ async def google_auth_callback(
                 logger.warning(f"Failed to get Google user info: {response.status_code} - {response.text}")
         
         # Check if user exists by supabase_user_id
-        user = db.query(User).filter(
+        result = await db.execute(select(User).where(
             User.supabase_user_id == supabase_user_id
-        ).first()
+        ))
+        user = result.scalars().first()
         
         if user:
             # Update existing user
@@ -149,8 +168,9 @@ async def google_auth_callback(
             
             db.add(user)
         
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
+        invalidate_user(user.id)
         
         # Create access token for our app
         access_token = create_access_token(data={"sub": str(user.id)})
@@ -162,7 +182,7 @@ async def google_auth_callback(
             message="Authentication successful"
         )
         
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Google API request error: {e}")
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -185,23 +205,25 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 async def update_current_user(
     user_update: schemas.UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user information"""
     update_data = user_update.dict(exclude_unset=True)
+    user = await load_user_for_update(db, current_user.id)
     
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
+    return user
 
 @router.put("/me/timezone", response_model=schemas.User)
 async def update_user_timezone(
     timezone_update: TimezoneUpdateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user timezone"""
     try:
@@ -209,11 +231,16 @@ async def update_user_timezone(
         import pytz
         pytz.timezone(timezone_update.timezone)
         
-        current_user.timezone = timezone_update.timezone
-        db.commit()
-        db.refresh(current_user)
+        user = await load_user_for_update(db, current_user.id)
+        if user.timezone != timezone_update.timezone:
+            user.timezone = timezone_update.timezone
+            # Stored due times are UTC instants of the local due date and time
+            await db.run_sync(recompute_due_at, user.id, user.timezone)
+        await db.commit()
+        await db.refresh(user)
+        invalidate_user(user.id)
         
-        return current_user
+        return user
         
     except pytz.exceptions.UnknownTimeZoneError:
         raise HTTPException(
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import update
 import logging
 
 from ..models.database import get_db
-from ..models.homework import Homework
+from ..models.homework import Homework, Status
+from ..models.calendar_outbox import CalendarOutbox, OutboxOperation, OutboxStatus
+from ..models.sync_change import SyncEntity
+from ..services.calendar_outbox import OPEN_STATUSES
+from ..services.sync_changes import record_bulk_changes
 from ..auth import get_current_user
 from ..services.google_calendar import GoogleCalendarService
 
@@ -11,43 +16,103 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
+# Sync handlers stay synchronous: the Google client is blocking, so they must
+# run in the threadpool rather than on the event loop.
+
 @router.post("/sync")
-async def sync_google_calendar(
+def sync_google_calendar(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Sync existing homework with Google Calendar"""
+    """Sync existing homework with Google Calendar.
+
+    Creates events for open homework without one and applies queued
+    deletions, grouped into batch requests. Edits to homework that already
+    has an event reach Google through the outbox worker, so they aren't
+    pushed again here. Each item succeeds or fails on its own; `results`
+    lists the outcome per item.
+    """
+    if not current_user.google_access_token:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No Google Calendar access. Please sign in with Google."
+        )
+    
     try:
-        if not current_user.google_access_token:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No Google Calendar access. Please sign in with Google."
+        # Get user's open homework
+        homework_list = db.query(Homework).options(joinedload(Homework.class_)).filter(
+            Homework.user_id == current_user.id,
+            Homework.status != Status.COMPLETED
+        ).all()
+        
+        # Homework whose event is already being created by the outbox worker
+        queued_ids = {
+            homework_id for (homework_id,) in db.query(CalendarOutbox.homework_id).filter(
+                CalendarOutbox.user_id == current_user.id,
+                CalendarOutbox.operation == OutboxOperation.CREATE,
+                CalendarOutbox.status.in_(OPEN_STATUSES)
             )
+        }
+        unsynced = [hw for hw in homework_list if not hw.google_calendar_event_id]
+        creates = [hw for hw in unsynced if hw.id not in queued_ids]
         
-        # Get user's homework
-        homework_list = db.query(Homework).filter(
-            Homework.user_id == current_user.id,
-            Homework.status != "completed"
+        # Deletions still waiting in the outbox can ride along in the same batches
+        pending_deletes = db.query(CalendarOutbox).filter(
+            CalendarOutbox.user_id == current_user.id,
+            CalendarOutbox.operation == OutboxOperation.DELETE,
+            CalendarOutbox.status == OutboxStatus.PENDING,
+            CalendarOutbox.event_id.isnot(None)
         ).all()
         
-        # Initialize Google Calendar service
-        calendar_service = GoogleCalendarService(current_user)
+        with GoogleCalendarService(current_user) as calendar_service:
+            results = calendar_service.batch_sync(
+                creates=creates,
+                delete_event_ids=[entry.event_id for entry in pending_deletes]
+            )
         
-        synced_count = 0
-        for homework in homework_list:
-            if not homework.google_calendar_event_id:
-                # Create calendar event for homework without one
-                event_id = calendar_service.create_homework_event(homework)
-                if event_id:
-                    homework.google_calendar_event_id = event_id
-                    synced_count += 1
+        event_ids = []
+        for result in results:
+            if result["operation"] == "create" and result["success"]:
+                event_ids.append({"id": result["homework_id"], "google_calendar_event_id": result["event_id"]})
+        if event_ids:
+            db.execute(update(Homework), event_ids)
+            record_bulk_changes(db, SyncEntity.HOMEWORK, current_user.id, [row["id"] for row in event_ids])
+        
+        deleted_event_ids = {r["event_id"] for r in results if r["operation"] == "delete" and r["success"]}
+        done_entry_ids = [entry.id for entry in pending_deletes if entry.event_id in deleted_event_ids]
+        if done_entry_ids:
+            db.execute(
+                update(CalendarOutbox)
+                .where(CalendarOutbox.id.in_(done_entry_ids), CalendarOutbox.status == OutboxStatus.PENDING)
+                .values(status=OutboxStatus.DONE),
+                execution_options={"synchronize_session": False}
+            )
         
         db.commit()
         
+        counts = {operation: 0 for operation in ("create", "delete")}
+        for result in results:
+            if result["success"]:
+                counts[result["operation"]] += 1
+        failed_count = sum(1 for result in results if not result["success"])
+        
         return {
-            "message": f"Successfully synced {synced_count} homework assignments with Google Calendar",
-            "synced_count": synced_count,
-            "total_homework": len(homework_list)
+            "message": f"Successfully synced {counts['create']} homework assignments with Google Calendar",
+            "synced_count": counts["create"],
+            "deleted_count": counts["delete"],
+            "failed_count": failed_count,
+            "queued_count": len(unsynced) - len(creates),
+            "total_homework": len(homework_list),
+            "results": [
+                {
+                    "operation": result["operation"],
+                    "homework_id": result["homework_id"],
+                    "event_id": result["event_id"],
+                    "success": result["success"],
+                    "error": result["error"],
+                }
+                for result in results
+            ]
         }
         
     except Exception as e:
@@ -58,7 +123,7 @@ async def sync_google_calendar(
         )
 
 @router.post("/sync/{homework_id}")
-async def sync_homework_to_calendar(
+def sync_homework_to_calendar(
     homework_id: int,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -84,21 +149,20 @@ async def sync_homework_to_calendar(
             )
         
         # Initialize Google Calendar service
-        calendar_service = GoogleCalendarService(current_user)
-        
-        if homework.google_calendar_event_id:
-            # Update existing event
-            success = calendar_service.update_homework_event(homework)
-            action = "updated"
-        else:
-            # Create new event
-            event_id = calendar_service.create_homework_event(homework)
-            if event_id:
-                homework.google_calendar_event_id = event_id
-                success = True
-                action = "created"
+        with GoogleCalendarService(current_user) as calendar_service:
+            if homework.google_calendar_event_id:
+                # Update existing event
+                success = calendar_service.update_homework_event(homework)
+                action = "updated"
             else:
-                success = False
+                # Create new event
+                event_id = calendar_service.create_homework_event(homework)
+                if event_id:
+                    homework.google_calendar_event_id = event_id
+                    success = True
+                    action = "created"
+                else:
+                    success = False
         
         if success:
             db.commit()
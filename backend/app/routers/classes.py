@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from typing import List
@@ -6,7 +6,10 @@ from typing import List
 from ..models.database import get_db
 from ..models.classes import Class, ClassType
 from ..models.user import User
+from ..models.loaders import class_options, homework_options
 from ..auth import get_current_user
+from ..etags import class_etag, homework_etag
+from ..services.academic_year import invalidate_user_year
 from .. import schemas
 
 router = APIRouter(prefix="/classes", tags=["classes"])
@@ -16,18 +19,21 @@ def get_class_types():
     """Get all available class types"""
     return [class_type.value for class_type in ClassType]
 
-@router.get("/", response_model=List[schemas.Class])
+@router.get("/", response_model=List[schemas.Class], dependencies=[Depends(class_etag)])
 def get_classes(
     skip: int = 0,
     limit: int = 100,
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all classes for current user"""
-    classes = db.query(Class).filter(Class.user_id == current_user.id).offset(skip).limit(limit).all()
+    classes = db.query(Class).options(*class_options(slim)).filter(
+        Class.user_id == current_user.id
+    ).order_by(Class.id).offset(skip).limit(limit).all()
     return classes
 
-@router.get("/{class_id}", response_model=schemas.Class)
+@router.get("/{class_id}", response_model=schemas.Class, dependencies=[Depends(class_etag)])
 def get_class(
     class_id: int,
     current_user: User = Depends(get_current_user),
@@ -57,6 +63,7 @@ def create_class(
     db.add(db_class)
     db.commit()
     db.refresh(db_class)
+    invalidate_user_year(current_user.id)
     return db_class
 
 @router.put("/{class_id}", response_model=schemas.Class)
@@ -82,6 +89,8 @@ def update_class(
     
     db.commit()
     db.refresh(db_class)
+    if "year" in update_data:
+        invalidate_user_year(current_user.id)
     return db_class
 
 @router.delete("/{class_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -102,11 +111,13 @@ def delete_class(
     
     db.delete(db_class)
     db.commit()
+    invalidate_user_year(current_user.id)
     return None
 
-@router.get("/{class_id}/homework", response_model=List[schemas.Homework])
+@router.get("/{class_id}/homework", response_model=List[schemas.Homework], dependencies=[Depends(homework_etag)])
 def get_class_homework(
     class_id: int,
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -122,7 +133,7 @@ def get_class_homework(
     if not class_:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    homework = db.query(Homework).filter(
+    homework = db.query(Homework).options(*homework_options(slim)).filter(
         and_(
             Homework.class_id == class_id,
             Homework.user_id == current_user.id
@@ -1,68 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, or_, func, case, select
 from datetime import datetime, date, timedelta
 
 from ..models.database import get_db
 from ..models.homework import Homework, Status
 from ..models.classes import Class
 from ..models.schedule import Schedule, ScheduleSlot
+from ..models.user import User
+from ..models.user_stats import UserStats
+from ..auth import get_current_user
+from ..timezones import local_now, local_day_bounds
+from ..services.academic_year import academic_year_cache
+from ..services.schedule_index import invalidate_schedule_index
+from ..services.sync_changes import record_all_deleted
+from ..models.sync_change import SyncEntity
 from .. import schemas
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary", response_model=schemas.DashboardSummary)
-def get_dashboard_summary(db: Session = Depends(get_db)):
-    """Get dashboard summary statistics"""
-    today = date.today()
-    week_start = today - timedelta(days=today.weekday())
-    week_end = week_start + timedelta(days=6)
+def get_dashboard_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get dashboard summary statistics - user-specific, days in the user's timezone"""
+    timezone_name = current_user.get_timezone()
+    today = local_now(timezone_name).date()
+    day_start, day_end = local_day_bounds(timezone_name, today)
+    week_start, week_end = local_day_bounds(timezone_name, today - timedelta(days=today.weekday()), days=7)
     
-    # Total classes
-    total_classes = db.query(Class).count()
-    
-    # Pending homework
-    pending_homework = db.query(Homework).filter(
-        Homework.status != Status.COMPLETED
-    ).count()
-    
-    # Due today
-    due_today = db.query(Homework).filter(
-        and_(
-            Homework.due_date == today,
-            Homework.status != Status.COMPLETED
-        )
-    ).count()
-    
-    # Overdue
-    overdue = db.query(Homework).filter(
-        and_(
-            Homework.due_date < today,
-            Homework.status != Status.COMPLETED
-        )
-    ).count()
+    is_open = Homework.status != Status.COMPLETED
+    completed_this_week = and_(
+        Homework.status == Status.COMPLETED,
+        Homework.completed_at >= week_start,
+        Homework.completed_at < week_end
+    )
     
-    # Completed this week
-    completed_this_week = db.query(Homework).filter(
-        and_(
-            Homework.status == Status.COMPLETED,
-            Homework.completed_at >= week_start,
-            Homework.completed_at <= week_end
+    # Single conditional-aggregate query. Only the rows that can contribute are
+    # scanned (open homework due up to today, homework completed this week);
+    # the class and pending totals come from scalar lookups.
+    row = db.query(
+        select(func.count(Class.id)).where(Class.user_id == current_user.id).scalar_subquery(),
+        # No counters row yet means no homework yet (existing users were backfilled by migration 0015)
+        func.coalesce(select(UserStats.pending_homework).where(UserStats.user_id == current_user.id).scalar_subquery(), 0),
+        func.count(case((and_(is_open, Homework.due_at >= day_start), 1))),
+        func.count(case((and_(is_open, Homework.due_at < day_start), 1))),
+        func.count(case((completed_this_week, 1)))
+    ).filter(
+        Homework.user_id == current_user.id,
+        or_(
+            and_(is_open, Homework.due_at < day_end),
+            completed_this_week
         )
-    ).count()
+    ).one()
+    total_classes, pending_homework, due_today, overdue, completed_count = row
     
     return schemas.DashboardSummary(
         total_classes=total_classes,
         pending_homework=pending_homework,
         due_today=due_today,
         overdue=overdue,
-        completed_this_week=completed_this_week
+        completed_this_week=completed_count
     )
 
 @router.delete("/clear-all-data")
 def clear_all_data(db: Session = Depends(get_db)):
     """Clear all data from the database - homework, classes, and schedules"""
     try:
+        # Bulk deletes skip the flush listener; leave tombstones for synced clients
+        record_all_deleted(db, [SyncEntity.SCHEDULE_SLOT, SyncEntity.SCHEDULE, SyncEntity.HOMEWORK, SyncEntity.CLASS])
+        
         # Delete in order to respect foreign key constraints
         # First delete schedule slots, then schedules
         db.query(ScheduleSlot).delete()
@@ -74,7 +82,12 @@ def clear_all_data(db: Session = Depends(get_db)):
         # Delete classes
         db.query(Class).delete()
         
+        # Reset the per-user homework counters
+        db.query(UserStats).delete()
+        
         db.commit()
+        academic_year_cache.clear()
+        invalidate_schedule_index()
         return {"message": "All data cleared successfully"}
     except Exception as e:
         db.rollback()
@@ -1,34 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, select
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import logging
 
 from ..models.database import get_db
 from ..models.homework import Homework, Status
 from ..models.classes import Class
 from ..models.user import User
+from ..models.user_stats import UserStats
+from ..models.loaders import homework_options
 from ..auth import get_current_user
-from ..services.google_calendar import GoogleCalendarService
+from ..etags import homework_etag, homework_due_etag
+from ..models.calendar_outbox import OutboxOperation
+from ..services.calendar_outbox import enqueue_calendar_operation, calendar_outbox_worker
+from ..services.user_stats import apply_homework_delta, status_delta
+from ..services.homework_bulk import apply_homework_bulk, load_homework_rows, NULLABLE_CHANGES
+from ..pagination import paginate
+from ..timezones import local_now, local_day_bounds, utc_minute
 from .. import schemas
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/homework", tags=["homework"])
 
-@router.get("/", response_model=List[schemas.Homework])
+# Keyset sort orders, each backed by a (user_id, ...) index on homework
+HOMEWORK_SORTS = {
+    schemas.HomeworkSort.DUE.value: ((Homework.due_date, False), (Homework.due_time, False), (Homework.id, False)),
+    schemas.HomeworkSort.UPDATED.value: ((Homework.updated_at, True), (Homework.id, True)),
+}
+
+@router.get("/", response_model=List[schemas.Homework], dependencies=[Depends(homework_etag)])
 def get_homework(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    sort: schemas.HomeworkSort = Query(schemas.HomeworkSort.DUE),
     class_id: Optional[int] = Query(None),
     status: Optional[schemas.Status] = Query(None),
     due_date: Optional[date] = Query(None),
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get homework with optional filters (user-specific)"""
-    query = db.query(Homework).filter(Homework.user_id == current_user.id)
+    """Get homework with optional filters (user-specific).
+
+    Pass `cursor` for keyset pagination; `skip` is still honoured when no cursor is given.
+    """
+    query = db.query(Homework).options(*homework_options(slim)).filter(Homework.user_id == current_user.id)
     
     if class_id:
         query = query.filter(Homework.class_id == class_id)
@@ -37,82 +58,122 @@ def get_homework(
     if due_date:
         query = query.filter(Homework.due_date == due_date)
     
-    homework = query.offset(skip).limit(limit).all()
-    return homework
+    return paginate(query, HOMEWORK_SORTS, sort.value, response, cursor=cursor, skip=skip, limit=limit)
 
-@router.get("/due-today", response_model=List[schemas.Homework])
+@router.get("/due-today", response_model=List[schemas.Homework], dependencies=[Depends(homework_etag)])
 def get_homework_due_today(
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get homework due today (considering both date and time) - user-specific"""
-    from datetime import datetime, time
-    today = date.today()
-    now = datetime.now()
-    current_time = now.time()
+    """Get open homework due today in the user's timezone, including items already past their time"""
+    timezone_name = current_user.get_timezone()
+    day_start, day_end = local_day_bounds(timezone_name, local_now(timezone_name).date())
     
-    # Get homework due today that is either:
-    # 1. Due today with time later than current time
-    # 2. Due today and it's already past the due time (still show as due today)
-    homework = db.query(Homework).filter(
-        and_(
-            Homework.user_id == current_user.id,
-            Homework.due_date == today,
-            Homework.status != Status.COMPLETED
-        )
-    ).all()
+    homework = db.query(Homework).options(*homework_options(slim)).filter(
+        Homework.user_id == current_user.id,
+        Homework.due_at >= day_start,
+        Homework.due_at < day_end,
+        Homework.status != Status.COMPLETED
+    ).order_by(Homework.due_at).all()
     return homework
 
-@router.get("/overdue", response_model=List[schemas.Homework])
+@router.get("/overdue", response_model=List[schemas.Homework], dependencies=[Depends(homework_due_etag)])
 def get_overdue_homework(
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get overdue homework - user-specific"""
-    from datetime import datetime, time
-    now = datetime.now()
-    today = now.date()
-    current_time = now.time()
-    
-    homework = db.query(Homework).filter(
-        and_(
-            Homework.user_id == current_user.id,
-            or_(
-                # Tasks due before today are overdue
-                Homework.due_date < today,
-                # Tasks due today but past their due time are overdue
-                and_(
-                    Homework.due_date == today,
-                    Homework.due_time < current_time
-                )
-            ),
-            Homework.status != Status.COMPLETED
-        )
-    ).all()
+    """Get open homework whose due date and time have passed - user-specific"""
+    homework = db.query(Homework).options(*homework_options(slim)).filter(
+        Homework.user_id == current_user.id,
+        Homework.due_at < utc_minute(),  # Matches the ETag (see user_due_etag)
+        Homework.status != Status.COMPLETED
+    ).order_by(Homework.due_at).all()
     return homework
 
-@router.get("/upcoming", response_model=List[schemas.Homework])
+@router.get("/upcoming", response_model=List[schemas.Homework], dependencies=[Depends(homework_etag)])
 def get_upcoming_homework(
     days: int = 7,
+    slim: bool = Query(False, description="Omit nested user objects"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get homework due in the next N days - user-specific"""
-    from datetime import timedelta
-    today = date.today()
-    future_date = today + timedelta(days=days)
+    """Get open homework due from today through the next N days (user's local days)"""
+    timezone_name = current_user.get_timezone()
+    range_start, range_end = local_day_bounds(timezone_name, local_now(timezone_name).date(), days=days + 1)
     
-    homework = db.query(Homework).filter(
-        and_(
-            Homework.user_id == current_user.id,
-            Homework.due_date >= today,
-            Homework.due_date <= future_date,
-            Homework.status != Status.COMPLETED
-        )
-    ).all()
+    homework = db.query(Homework).options(*homework_options(slim)).filter(
+        Homework.user_id == current_user.id,
+        Homework.due_at >= range_start,
+        Homework.due_at < range_end,
+        Homework.status != Status.COMPLETED
+    ).order_by(Homework.due_at).all()
     return homework
 
-@router.get("/{homework_id}", response_model=schemas.Homework)
+@router.get("/buckets", response_model=schemas.HomeworkBuckets, dependencies=[Depends(homework_due_etag)])
+def get_homework_buckets(
+    days: int = Query(7, ge=0, le=366),
+    slim: bool = Query(False, description="Omit nested user objects"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Everything the dashboard page shows, in one request.
+
+    Open homework due up to the end of the upcoming window is read in one
+    (user_id, due_at) range scan and split into the overdue, due-today and
+    upcoming lists (same rules as the separate endpoints). The summary counts
+    come from the same rows plus one query for the class, pending and
+    completed-this-week totals.
+    """
+    timezone_name = current_user.get_timezone()
+    today = local_now(timezone_name).date()
+    day_start, day_end = local_day_bounds(timezone_name, today)
+    upcoming_end = local_day_bounds(timezone_name, today, days=days + 1)[1]
+    week_start, week_end = local_day_bounds(timezone_name, today - timedelta(days=today.weekday()), days=7)
+    now = utc_minute()  # Matches the ETag (see user_due_etag)
+    
+    total_classes, pending_homework, completed_this_week = db.query(
+        select(func.count(Class.id)).where(Class.user_id == current_user.id).scalar_subquery(),
+        # No counters row yet means no homework yet (see the dashboard summary)
+        func.coalesce(select(UserStats.pending_homework).where(UserStats.user_id == current_user.id).scalar_subquery(), 0),
+        select(func.count(Homework.id)).where(
+            Homework.user_id == current_user.id,
+            Homework.status == Status.COMPLETED,
+            Homework.completed_at >= week_start,
+            Homework.completed_at < week_end
+        ).scalar_subquery()
+    ).one()
+    open_homework = db.query(Homework).options(*homework_options(slim)).filter(
+        Homework.user_id == current_user.id,
+        Homework.due_at < upcoming_end,
+        Homework.status != Status.COMPLETED
+    ).order_by(Homework.due_at).all()
+    
+    buckets = {"overdue": [], "due_today": [], "upcoming": []}
+    past_days = 0  # Open homework due before today (the summary's "overdue")
+    for item in open_homework:
+        if item.due_at < now:
+            buckets["overdue"].append(item)
+        if item.due_at < day_start:
+            past_days += 1
+            continue
+        if item.due_at < day_end:
+            buckets["due_today"].append(item)
+        buckets["upcoming"].append(item)
+    
+    return schemas.HomeworkBuckets(
+        summary=schemas.DashboardSummary(
+            total_classes=total_classes,
+            pending_homework=pending_homework,
+            due_today=len(buckets["due_today"]),
+            overdue=past_days,
+            completed_this_week=completed_this_week
+        ),
+        **buckets
+    )
+
+@router.get("/{homework_id}", response_model=schemas.Homework, dependencies=[Depends(homework_etag)])
 def get_homework_item(
     homework_id: int,
     current_user: User = Depends(get_current_user),
@@ -135,7 +196,7 @@ def create_homework(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create a new homework item with Google Calendar integration"""
+    """Create a new homework item; the Google Calendar event is created in the background"""
     # Verify class exists and belongs to user
     class_ = db.query(Class).filter(
         and_(
@@ -151,23 +212,80 @@ def create_homework(
     homework_dict["user_id"] = current_user.id
     db_homework = Homework(**homework_dict)
     db.add(db_homework)
+    apply_homework_delta(db, current_user.id, **status_delta(None, Status.PENDING))
+    db.flush()  # Assign the id for the outbox entry
+    enqueue_calendar_operation(db, current_user, OutboxOperation.CREATE, homework_id=db_homework.id)
     db.commit()
     db.refresh(db_homework)
-    
-    # Create Google Calendar event if user has tokens
-    if current_user.google_access_token:
-        try:
-            calendar_service = GoogleCalendarService(current_user)
-            event_id = calendar_service.create_homework_event(db_homework)
-            if event_id:
-                db_homework.google_calendar_event_id = event_id
-                db.commit()
-                db.refresh(db_homework)
-        except Exception as e:
-            logger.error(f"Failed to create calendar event for homework {db_homework.id}: {e}")
+    calendar_outbox_worker.notify()
     
     return db_homework
 
+@router.post("/bulk", response_model=schemas.HomeworkBulkResult)
+def bulk_homework(
+    bulk_data: schemas.HomeworkBulkRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create, update, complete, reopen and delete up to 1000 homework items at once.
+
+    All-or-nothing, in one transaction with a fixed number of statements;
+    Google Calendar changes are queued for the background worker as one batch.
+    """
+    Action = schemas.HomeworkBulkAction
+    target_ids = []
+    for index, operation in enumerate(bulk_data.operations):
+        if operation.action == Action.CREATE:
+            missing = "homework" if operation.homework is None else None
+        else:
+            missing = "id" if operation.id is None else None
+            if operation.action == Action.UPDATE and operation.changes is None:
+                missing = missing or "changes"
+            target_ids.append(operation.id)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Operation {index} ({operation.action.value}) needs `{missing}`"
+            )
+        if operation.action == Action.UPDATE:
+            nulls = [
+                field for field, value in operation.changes.dict(exclude_unset=True).items()
+                if value is None and field not in NULLABLE_CHANGES
+            ]
+            if nulls:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Operation {index} (update) can't set `{nulls[0]}` to null"
+                )
+    
+    seen = set()
+    for homework_id in target_ids:
+        if homework_id in seen:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Homework {homework_id} is targeted by more than one operation"
+            )
+        seen.add(homework_id)
+    
+    # Every class used by a create must belong to the user; one IN query
+    class_ids = {op.homework.class_id for op in bulk_data.operations if op.action == Action.CREATE}
+    if class_ids:
+        owned = {
+            class_id for (class_id,) in
+            db.query(Class.id).filter(Class.user_id == current_user.id, Class.id.in_(class_ids))
+        }
+        if owned != class_ids:
+            raise HTTPException(status_code=404, detail=f"Class not found: {min(class_ids - owned)}")
+    
+    targets = load_homework_rows(db, current_user.id, seen)
+    if len(targets) != len(seen):
+        raise HTTPException(status_code=404, detail=f"Homework not found: {min(seen - set(targets))}")
+    
+    result = apply_homework_bulk(db, current_user, bulk_data.operations, targets)
+    db.commit()
+    calendar_outbox_worker.notify()
+    return result
+
 @router.put("/{homework_id}", response_model=schemas.Homework)
 def update_homework(
     homework_id: int,
@@ -175,7 +293,7 @@ def update_homework(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update a homework item with Google Calendar sync"""
+    """Update a homework item; the Google Calendar event is updated in the background"""
     db_homework = db.query(Homework).filter(
         and_(
             Homework.id == homework_id,
@@ -186,28 +304,28 @@ def update_homework(
         raise HTTPException(status_code=404, detail="Homework not found")
     
     update_data = homework_data.dict(exclude_unset=True)
+    old_status = db_homework.status
     
     # Handle status completion
-    if "status" in update_data and update_data["status"] == Status.COMPLETED:
+    if "status" in update_data and update_data["status"] == schemas.Status.COMPLETED:
         update_data["completed_at"] = datetime.utcnow()
-    elif "status" in update_data and update_data["status"] != Status.COMPLETED:
+    elif "status" in update_data and update_data["status"] != schemas.Status.COMPLETED:
         update_data["completed_at"] = None
     
     for field, value in update_data.items():
         setattr(db_homework, field, value)
     
+    if "status" in update_data:
+        apply_homework_delta(db, current_user.id, **status_delta(old_status, update_data["status"]))
+    
+    # The event may not exist yet if its CREATE entry is still queued; the worker
+    # processes a user's entries in order, so the UPDATE will see the event id.
+    if any(field in update_data for field in ["title", "description", "due_date", "due_time", "priority"]):
+        enqueue_calendar_operation(db, current_user, OutboxOperation.UPDATE, homework_id=db_homework.id)
+    
     db.commit()
     db.refresh(db_homework)
-    
-    # Update Google Calendar event if it exists and user has tokens
-    if (current_user.google_access_token and 
-        db_homework.google_calendar_event_id and
-        any(field in update_data for field in ["title", "description", "due_date", "due_time", "priority"])):
-        try:
-            calendar_service = GoogleCalendarService(current_user)
-            calendar_service.update_homework_event(db_homework)
-        except Exception as e:
-            logger.error(f"Failed to update calendar event for homework {db_homework.id}: {e}")
+    calendar_outbox_worker.notify()
     
     return db_homework
 
@@ -227,6 +345,8 @@ def complete_homework(
     if not db_homework:
         raise HTTPException(status_code=404, detail="Homework not found")
     
+    apply_homework_delta(db, current_user.id, **status_delta(db_homework.status, Status.COMPLETED))
+    
     db_homework.status = Status.COMPLETED
     db_homework.completed_at = datetime.utcnow()
     
@@ -250,6 +370,8 @@ def reopen_homework(
     if not db_homework:
         raise HTTPException(status_code=404, detail="Homework not found")
     
+    apply_homework_delta(db, current_user.id, **status_delta(db_homework.status, Status.PENDING))
+    
     db_homework.status = Status.PENDING
     db_homework.completed_at = None
     
@@ -273,15 +395,16 @@ def delete_homework(
     if not db_homework:
         raise HTTPException(status_code=404, detail="Homework not found")
     
-    # Delete Google Calendar event if it exists
-    if (current_user.google_access_token and 
-        db_homework.google_calendar_event_id):
-        try:
-            calendar_service = GoogleCalendarService(current_user)
-            calendar_service.delete_homework_event(db_homework.google_calendar_event_id)
-        except Exception as e:
-            logger.error(f"Failed to delete calendar event for homework {db_homework.id}: {e}")
+    # Delete the Google Calendar event in the background. With no event id yet,
+    # the worker falls back to the id stored by this homework's CREATE entry.
+    enqueue_calendar_operation(
+        db, current_user, OutboxOperation.DELETE,
+        homework_id=db_homework.id,
+        event_id=db_homework.google_calendar_event_id
+    )
     
+    apply_homework_delta(db, current_user.id, **status_delta(db_homework.status, None))
     db.delete(db_homework)
     db.commit()
+    calendar_outbox_worker.notify()
     return None
\ No newline at end of file
@@ -1,39 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import and_, or_
 from typing import List, Optional
+from datetime import datetime, timedelta
 import logging
 
 from ..models.database import get_db
-from ..models.notes import Note, EducationLevel
-from ..models.classes import Class, ClassType
+from ..models.notes import Note, EducationLevel, DriveStatus
+from ..models.classes import ClassType
 from ..models.user import User
 from ..auth import get_current_user
+from ..etags import note_etag
 from ..services.google_drive import GoogleDriveService
+from ..services.drive_files import get_drive_file, ensure_public, enrich_note_drive_file
+from ..services.note_search import search_terms, apply_search
+from ..services.academic_year import get_user_current_year
+from ..services.note_facets import facet_key, apply_facet_delta, facet_counts
+from ..services.public_notes_cache import cached_json_response, invalidate_public_notes
+from ..pagination import paginate, NEXT_CURSOR_HEADER
 from .. import schemas
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
-def get_user_current_year(user_id: int, db: Session) -> str:
-    """Get the most common year from user's classes"""
-    classes = db.query(Class).filter(Class.user_id == user_id).all()
-    if not classes:
-        # Default to current academic year if no classes
-        from datetime import datetime
-        current_year = datetime.now().year
-        return f"{current_year}-{current_year + 1}"
-    
-    # Get the most common year from user's classes
-    years = [cls.year for cls in classes]
-    most_common_year = max(set(years), key=years.count) if years else f"{datetime.now().year}-{datetime.now().year + 1}"
-    return most_common_year
+# Keyset sort order (most recently updated first), backed by the notes user/public indexes
+NOTE_SORTS = {
+    "updated": ((Note.updated_at, True), (Note.id, True)),
+}
 
-@router.get("/", response_model=List[schemas.Note])
+public_notes_json = TypeAdapter(List[schemas.PublicNote])
+
+# Drive enrichment still pending after this long is assumed lost and restarted
+STALE_DRIVE_ENRICHMENT = timedelta(minutes=1)
+
+@router.get("/", response_model=List[schemas.Note], dependencies=[Depends(note_etag)])
 def get_user_notes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     class_type: Optional[schemas.ClassType] = Query(None),
     is_public: Optional[bool] = Query(None),
     current_user: User = Depends(get_current_user),
@@ -47,20 +54,16 @@ def get_user_notes(
     if is_public is not None:
         query = query.filter(Note.is_public == is_public)
     
-    notes = query.order_by(desc(Note.updated_at)).offset(skip).limit(limit).all()
-    return notes
+    return paginate(query, NOTE_SORTS, "updated", response, cursor=cursor, skip=skip, limit=limit)
 
-@router.get("/public", response_model=List[schemas.PublicNote])
-def get_public_notes(
-    skip: int = 0,
-    limit: int = 100,
-    class_type: Optional[schemas.ClassType] = Query(None),
-    education_level: Optional[schemas.EducationLevel] = Query(None),
-    year: Optional[str] = Query(None),
-    school: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+def public_notes_query(
+    db: Session,
+    class_type: Optional[schemas.ClassType] = None,
+    education_level: Optional[schemas.EducationLevel] = None,
+    year: Optional[str] = None,
+    school: Optional[str] = None
 ):
-    """Get public notes from all users with optional filters"""
+    """Public notes matching the browse filters"""
     query = db.query(Note).filter(Note.is_public == True)
     
     if class_type:
@@ -71,13 +74,12 @@ def get_public_notes(
         query = query.filter(Note.year == year)
     if school:
         query = query.filter(Note.school.ilike(f"%{school}%"))
-    
-    notes = query.order_by(desc(Note.updated_at)).offset(skip).limit(limit).all()
-    
-    # Convert to PublicNote schema (excludes user details)
-    public_notes = []
-    for note in notes:
-        public_notes.append(schemas.PublicNote(
+    return query
+
+def to_public_notes(notes: List[Note]) -> List[schemas.PublicNote]:
+    """Convert to PublicNote schema (excludes user details)"""
+    return [
+        schemas.PublicNote(
             id=note.id,
             title=note.title,
             content=note.content,
@@ -91,9 +93,93 @@ def get_public_notes(
             google_drive_file_url=note.google_drive_file_url,
             google_drive_file_name=note.google_drive_file_name,
             google_drive_mime_type=note.google_drive_mime_type
-        ))
+        )
+        for note in notes
+    ]
+
+@router.get("/public", response_model=List[schemas.PublicNote])
+def get_public_notes(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    class_type: Optional[schemas.ClassType] = Query(None),
+    education_level: Optional[schemas.EducationLevel] = Query(None),
+    year: Optional[str] = Query(None),
+    school: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Get public notes from all users with optional filters.
+
+    The same for every visitor, so pages are cached as serialized JSON and
+    sent with ETag / Cache-Control headers.
+    """
+    school = school.strip() if school else None
+    key = (
+        class_type.value if class_type else None,
+        education_level.value if education_level else None,
+        year,
+        school.lower() if school else None,  # ilike: case doesn't matter
+        cursor,
+        skip,
+        limit,
+    )
+    
+    def build():
+        page = Response()
+        query = public_notes_query(db, class_type, education_level, year, school)
+        notes = paginate(query, NOTE_SORTS, "updated", page, cursor=cursor, skip=skip, limit=limit)
+        return public_notes_json.dump_json(to_public_notes(notes)), page.headers.get(NEXT_CURSOR_HEADER)
+    
+    return cached_json_response(request, key, build)
+
+@router.get("/public/search", response_model=List[schemas.PublicNote])
+def search_public_notes(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for in title, content, school and Drive file name"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    class_type: Optional[schemas.ClassType] = Query(None),
+    education_level: Optional[schemas.EducationLevel] = Query(None),
+    year: Optional[str] = Query(None),
+    school: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over public notes, best matches first.
+
+    Every word must match (as a prefix); the browse filters apply on top.
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Search query has no searchable words")
     
-    return public_notes
+    query = public_notes_query(db, class_type, education_level, year, school)
+    notes = apply_search(query, terms, db.get_bind().dialect.name).offset(skip).limit(limit).all()
+    return to_public_notes(notes)
+
+@router.get("/public/facets", response_model=schemas.PublicNoteFacets)
+def get_public_note_facets(
+    request: Request,
+    class_type: Optional[schemas.ClassType] = Query(None),
+    education_level: Optional[schemas.EducationLevel] = Query(None),
+    year: Optional[str] = Query(None),
+    school: Optional[str] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Public note counts per class type, education level, year and school.
+
+    Served from the precomputed public_note_facets table (and the public
+    feed cache); filters narrow the counts like they narrow the feed.
+    """
+    school = school.strip() if school else None
+    class_type = class_type.value if class_type else None
+    education_level = education_level.value if education_level else None
+    key = ("facets", class_type, education_level, year, school.lower() if school else None)
+    
+    def build():
+        counts = facet_counts(db, class_type, education_level, year, school)
+        return schemas.PublicNoteFacets(**counts).model_dump_json().encode(), None
+    
+    return cached_json_response(request, key, build)
 
 @router.get("/education-levels", response_model=List[dict])
 def get_education_levels(lang: Optional[str] = Query(None)):
@@ -126,7 +212,7 @@ def get_education_levels(lang: Optional[str] = Query(None)):
     
     return levels
 
-@router.get("/{note_id}", response_model=schemas.Note)
+@router.get("/{note_id}", response_model=schemas.Note, dependencies=[Depends(note_etag)])
 def get_note(
     note_id: int,
     current_user: User = Depends(get_current_user),
@@ -146,10 +232,15 @@ def get_note(
 @router.post("/", response_model=schemas.Note, status_code=status.HTTP_201_CREATED)
 def create_note(
     note_data: schemas.NoteCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create a new note for current user"""
+    """Create a new note for current user.
+
+    Returns at once; an attached Drive file has `drive_status` PENDING until
+    the background job has resolved it.
+    """
     # Get current year from user's classes
     current_year = get_user_current_year(current_user.id, db)
     
@@ -157,36 +248,15 @@ def create_note(
     note_dict["user_id"] = current_user.id
     note_dict["year"] = current_year
     
-    # Process Google Drive file if provided
+    # Google Drive file details are resolved in the background (see drive-status)
     if note_dict.get('google_drive_file_url') and note_dict['google_drive_file_url'].strip():
-        try:
-            drive_service = GoogleDriveService(current_user)
-            
-            # Extract file ID from URL
-            file_id = drive_service.extract_file_id_from_url(note_dict['google_drive_file_url'])
-            if file_id and drive_service.verify_file_access(file_id):
-                file_info = drive_service.get_file_info(file_id)
-                if file_info:
-                    note_dict['google_drive_file_id'] = file_id
-                    note_dict['google_drive_file_url'] = file_info.get('webViewLink')
-                    note_dict['google_drive_file_name'] = note_dict.get('google_drive_file_name') or file_info.get('name')
-                    note_dict['google_drive_mime_type'] = file_info.get('mimeType')
-                    
-                    # Make file shareable if note is public
-                    if note_dict.get('is_public', False):
-                        drive_service.make_file_shareable(file_id)
-                else:
-                    logger.warning(f"Could not get file info for {file_id}")
-            else:
-                logger.warning(f"Invalid or inaccessible Google Drive file: {note_dict['google_drive_file_url']}")
-                # Clear invalid Google Drive data
-                note_dict['google_drive_file_id'] = None
-                note_dict['google_drive_file_url'] = None
-                note_dict['google_drive_file_name'] = None
-                note_dict['google_drive_mime_type'] = None
-        except Exception as e:
-            logger.warning(f"Error processing Google Drive file during note creation: {str(e)}")
-            # Clear Google Drive data if there's an error
+        file_id = GoogleDriveService.extract_file_id_from_url(note_dict['google_drive_file_url'])
+        if file_id:
+            note_dict['google_drive_file_id'] = file_id
+            note_dict['drive_status'] = DriveStatus.PENDING
+        else:
+            logger.warning(f"Invalid Google Drive URL: {note_dict['google_drive_file_url']}")
+            # Clear invalid Google Drive data
             note_dict['google_drive_file_id'] = None
             note_dict['google_drive_file_url'] = None
             note_dict['google_drive_file_name'] = None
@@ -194,14 +264,21 @@ def create_note(
     
     db_note = Note(**note_dict)
     db.add(db_note)
+    apply_facet_delta(db, None, facet_key(db_note))
     db.commit()
     db.refresh(db_note)
+    if db_note.is_public:
+        invalidate_public_notes()
+    
+    if db_note.drive_status == DriveStatus.PENDING:
+        background_tasks.add_task(enrich_note_drive_file, db_note.id, db_note.google_drive_file_id)
     return db_note
 
 @router.put("/{note_id}", response_model=schemas.Note)
 def update_note(
     note_id: int,
     note_data: schemas.NoteUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -219,73 +296,79 @@ def update_note(
     # Update note fields
     update_data = note_data.dict(exclude_unset=True)
     
-    # Process Google Drive file if URL is being updated
+    # Google Drive file details are resolved in the background (see drive-status)
     if 'google_drive_file_url' in update_data:
         drive_url = update_data.get('google_drive_file_url')
+        file_id = GoogleDriveService.extract_file_id_from_url(drive_url) if drive_url and drive_url.strip() else None
         
-        if drive_url and drive_url.strip():
-            try:
-                drive_service = GoogleDriveService(current_user)
-                
-                # Extract file ID from URL
-                file_id = drive_service.extract_file_id_from_url(drive_url)
-                if file_id and drive_service.verify_file_access(file_id):
-                    file_info = drive_service.get_file_info(file_id)
-                    if file_info:
-                        update_data['google_drive_file_id'] = file_id
-                        update_data['google_drive_file_url'] = file_info.get('webViewLink')
-                        # Only update file name if not explicitly provided
-                        if 'google_drive_file_name' not in update_data or not update_data['google_drive_file_name']:
-                            update_data['google_drive_file_name'] = file_info.get('name')
-                        update_data['google_drive_mime_type'] = file_info.get('mimeType')
-                        
-                        # Make file shareable if note is or will be public
-                        is_public = update_data.get('is_public', note.is_public)
-                        if is_public:
-                            drive_service.make_file_shareable(file_id)
-                    else:
-                        logger.warning(f"Could not get file info for {file_id}")
-                        # Clear invalid Google Drive data
-                        update_data.update({
-                            'google_drive_file_id': None,
-                            'google_drive_file_url': None,
-                            'google_drive_file_name': None,
-                            'google_drive_mime_type': None
-                        })
-                else:
-                    logger.warning(f"Invalid or inaccessible Google Drive file: {drive_url}")
-                    # Clear invalid Google Drive data
-                    update_data.update({
-                        'google_drive_file_id': None,
-                        'google_drive_file_url': None,
-                        'google_drive_file_name': None,
-                        'google_drive_mime_type': None
-                    })
-            except Exception as e:
-                logger.warning(f"Error processing Google Drive file during note update: {str(e)}")
-                # Clear Google Drive data if there's an error
-                update_data.update({
-                    'google_drive_file_id': None,
-                    'google_drive_file_url': None,
-                    'google_drive_file_name': None,
-                    'google_drive_mime_type': None
-                })
+        if file_id:
+            update_data['google_drive_file_id'] = file_id
+            update_data['drive_status'] = DriveStatus.PENDING
+            if file_id != note.google_drive_file_id:
+                # Details of the previous file must not carry over to the new one
+                update_data.setdefault('google_drive_file_name', None)
+                update_data['google_drive_mime_type'] = None
         else:
-            # Empty URL - clear all Google Drive data
+            if drive_url and drive_url.strip():
+                logger.warning(f"Invalid Google Drive URL: {drive_url}")
+            # Empty or invalid URL - clear all Google Drive data
             update_data.update({
                 'google_drive_file_id': None,
                 'google_drive_file_url': None,
                 'google_drive_file_name': None,
-                'google_drive_mime_type': None
+                'google_drive_mime_type': None,
+                'drive_status': None
             })
+    elif update_data.get('is_public') and not note.is_public and note.google_drive_file_id:
+        # Note becomes public: its Drive file must be shared
+        update_data['drive_status'] = DriveStatus.PENDING
     
+    was_public = note.is_public
+    old_facet = facet_key(note)
     for field, value in update_data.items():
         setattr(note, field, value)
+    apply_facet_delta(db, old_facet, facet_key(note))
     
     db.commit()
     db.refresh(note)
+    if was_public or note.is_public:
+        invalidate_public_notes()
+    
+    if update_data.get('drive_status') == DriveStatus.PENDING:
+        background_tasks.add_task(enrich_note_drive_file, note.id, note.google_drive_file_id)
     return note
 
+@router.get("/{note_id}/drive-status", response_model=schemas.NoteDriveStatus)
+def get_note_drive_status(
+    note_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Poll the background Google Drive enrichment of a note"""
+    note = db.query(Note).filter(
+        and_(
+            Note.id == note_id,
+            Note.user_id == current_user.id
+        )
+    ).first()
+    
+    if not note:
+        raise HTTPException(status_code=404, detail="Note not found")
+    
+    # A job lost to a restart would leave the note pending forever; start another
+    if note.drive_status == DriveStatus.PENDING and note.updated_at < datetime.utcnow() - STALE_DRIVE_ENRICHMENT:
+        background_tasks.add_task(enrich_note_drive_file, note.id, note.google_drive_file_id)
+    
+    return schemas.NoteDriveStatus(
+        note_id=note.id,
+        drive_status=note.drive_status.value if note.drive_status else None,
+        google_drive_file_id=note.google_drive_file_id,
+        google_drive_file_url=note.google_drive_file_url,
+        google_drive_file_name=note.google_drive_file_name,
+        google_drive_mime_type=note.google_drive_mime_type
+    )
+
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_note(
     note_id: int,
@@ -303,8 +386,12 @@ def delete_note(
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
+    was_public = note.is_public
+    apply_facet_delta(db, facet_key(note), None)
     db.delete(note)
     db.commit()
+    if was_public:
+        invalidate_public_notes()
     return None
 
 # Google Drive integration endpoints
@@ -313,6 +400,7 @@ def delete_note(
 def attach_google_drive_file(
     note_id: int,
     drive_url: str = Query(..., description="Google Drive file URL or ID"),
+    refresh: bool = Query(False, description="Ignore cached Drive metadata"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -329,26 +417,19 @@ def attach_google_drive_file(
         raise HTTPException(status_code=404, detail="Note not found")
     
     try:
-        # Initialize Google Drive service
-        drive_service = GoogleDriveService(current_user)
-        
         # Extract file ID from URL
-        file_id = drive_service.extract_file_id_from_url(drive_url)
+        file_id = GoogleDriveService.extract_file_id_from_url(drive_url)
         if not file_id:
             raise HTTPException(status_code=400, detail="Invalid Google Drive URL or file ID")
         
-        # Verify user has access to the file
-        if not drive_service.verify_file_access(file_id):
-            raise HTTPException(status_code=403, detail="You don't have access to this Google Drive file")
-        
-        # Get file information
-        file_info = drive_service.get_file_info(file_id)
+        # Verify access and get file information (one Drive call, or none if cached)
+        file_info = get_drive_file(db, current_user, file_id, refresh=refresh, recheck_no_access=True)
         if not file_info:
-            raise HTTPException(status_code=404, detail="Google Drive file not found")
+            raise HTTPException(status_code=403, detail="You don't have access to this Google Drive file")
         
         # If note is public, make the file shareable
         if note.is_public:
-            if not drive_service.make_file_shareable(file_id):
+            if not ensure_public(db, current_user, file_id, file_info):
                 logger.warning(f"Could not make file {file_id} publicly shareable for public note")
         
         # Update note with Google Drive file information
@@ -356,9 +437,12 @@ def attach_google_drive_file(
         note.google_drive_file_url = file_info.get('webViewLink')
         note.google_drive_file_name = file_info.get('name')
         note.google_drive_mime_type = file_info.get('mimeType')
+        note.drive_status = DriveStatus.READY
         
         db.commit()
         db.refresh(note)
+        if note.is_public:
+            invalidate_public_notes()
         
         logger.info(f"Attached Google Drive file {file_id} to note {note_id}")
         return note
@@ -391,9 +475,12 @@ def detach_google_drive_file(
     note.google_drive_file_url = None
     note.google_drive_file_name = None
     note.google_drive_mime_type = None
+    note.drive_status = None
     
     db.commit()
     db.refresh(note)
+    if note.is_public:
+        invalidate_public_notes()
     
     logger.info(f"Detached Google Drive file from note {note_id}")
     return note
@@ -401,19 +488,16 @@ def detach_google_drive_file(
 @router.get("/google-drive/file-info/{file_id}")
 def get_drive_file_info(
     file_id: str,
-    current_user: User = Depends(get_current_user)
+    refresh: bool = Query(False, description="Ignore cached Drive metadata"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """Get information about a Google Drive file"""
     try:
-        drive_service = GoogleDriveService(current_user)
-        
-        # Verify user has access to the file
-        if not drive_service.verify_file_access(file_id):
-            raise HTTPException(status_code=403, detail="You don't have access to this Google Drive file")
-        
-        file_info = drive_service.get_file_info(file_id)
+        file_info = get_drive_file(db, current_user, file_id, refresh=refresh)
+        db.commit()
         if not file_info:
-            raise HTTPException(status_code=404, detail="Google Drive file not found")
+            raise HTTPException(status_code=403, detail="You don't have access to this Google Drive file")
         
         return {
             "id": file_info.get("id"),
@@ -426,4 +510,4 @@ def get_drive_file_info(
         raise
     except Exception as e:
         logger.error(f"Error getting Google Drive file info: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to get file information")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get file information")
@@ -1,33 +1,143 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import update
+from typing import List, Optional
+from datetime import datetime
+from types import SimpleNamespace
 
 from ..models.database import get_db
 from ..models.schedule import Schedule, ScheduleSlot
 from ..models.user import User
+from ..models.classes import Class
+from ..models.homework import Homework, Status
+from ..models.loaders import homework_options, schedule_options, schedule_slot_options, schedule_with_slots_options
 from .. import schemas
 from ..auth import get_current_user
+from ..etags import schedule_etag, global_etag
+from ..models.sync_change import SyncEntity
+from ..services.sync_changes import record_changes
+from ..services.schedule_grid import build_grid, replace_grid
+from ..timezones import local_now
+from ..services.slot_conflicts import find_conflicts, conflicts_with, describe_conflicts, locked_schedule
+from ..services.schedule_index import (
+    get_slot_index, slot_changed, slot_deleted, invalidate_schedule_index, local_week_minute
+)
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
-@router.get("/", response_model=List[schemas.Schedule])
-def get_schedules(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def deactivate_year(db: Session, year: str) -> None:
+    """Deactivate every active schedule of a year, logging the changes for sync"""
+    deactivated = db.execute(
+        update(Schedule)
+        .where(Schedule.year == year, Schedule.is_active == True)
+        .values(is_active=False)
+        .returning(Schedule.id, Schedule.user_id)
+    ).all()
+    record_changes(db.connection(), {
+        (SyncEntity.SCHEDULE, schedule_id): (user_id, False) for schedule_id, user_id in deactivated
+    })
+
+def raise_conflicts(conflicts: List[dict]):
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": "Schedule slots conflict", "conflicts": describe_conflicts(conflicts)}
+    )
+
+# Homework items listed per slot in GET /now
+NOW_HOMEWORK_LIMIT = 5
+
+@router.get("/", response_model=List[schemas.Schedule], dependencies=[Depends(global_etag)])
+def get_schedules(
+    skip: int = 0,
+    limit: int = 100,
+    slim: bool = Query(False, description="Omit nested user objects"),
+    db: Session = Depends(get_db)
+):
     """Get all schedules"""
-    schedules = db.query(Schedule).offset(skip).limit(limit).all()
+    schedules = db.query(Schedule).options(*schedule_options(slim)).order_by(Schedule.id).offset(skip).limit(limit).all()
     return schedules
 
-@router.get("/{schedule_id}", response_model=schemas.ScheduleWithSlots)
-def get_schedule(schedule_id: int, db: Session = Depends(get_db)):
+@router.get("/now", response_model=schemas.NowNext)
+def get_now_next(
+    at: Optional[datetime] = Query(None, description="Another moment to look up (naive = the user's local time)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Current and next slot of the user's active schedule, in the user's timezone.
+
+    Slots come from an in-memory per-user index, so polling only costs the
+    queries for the two slots' classes and pending homework.
+    """
+    now = local_now(current_user.get_timezone(), at)
+    index = get_slot_index(db, current_user.id)
+    current, following, starts_in = index.lookup(local_week_minute(now))
+    
+    found = [slot for slot in (current, following) if slot]
+    class_ids = {slot["class_id"] for slot in found if slot["class_id"] is not None}
+    classes, homework = {}, {class_id: [] for class_id in class_ids}
+    if class_ids:
+        classes = {class_.id: class_ for class_ in db.query(Class).filter(Class.id.in_(class_ids))}
+        pending = db.query(Homework).options(*homework_options(slim=True)).filter(
+            Homework.user_id == current_user.id,
+            Homework.class_id.in_(class_ids),
+            Homework.status != Status.COMPLETED,
+            Homework.due_date >= now.date()
+        ).order_by(Homework.due_date, Homework.due_time, Homework.id)
+        for item in pending:
+            if len(homework[item.class_id]) < NOW_HOMEWORK_LIMIT:
+                homework[item.class_id].append(item)
+    
+    def describe(slot):
+        if slot is None:
+            return None
+        class_ = classes.get(slot["class_id"])
+        return schemas.CurrentSlot(
+            **{field: value for field, value in slot.items() if field != "class_id"},
+            class_=schemas.GridClass.model_validate(class_, from_attributes=True) if class_ else None,
+            homework=homework.get(slot["class_id"], [])
+        )
+    
+    return schemas.NowNext(
+        schedule_id=index.schedule_id,
+        timezone=str(now.tzinfo),
+        local_time=now,
+        current=describe(current),
+        next=describe(following),
+        next_starts_in_minutes=starts_in
+    )
+
+@router.get("/{schedule_id}", response_model=schemas.ScheduleWithSlots, dependencies=[Depends(schedule_etag)])
+def get_schedule(
+    schedule_id: int,
+    slim: bool = Query(False, description="Omit nested user objects"),
+    db: Session = Depends(get_db)
+):
     """Get a specific schedule with its slots"""
-    schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
+    schedule = db.query(Schedule).options(*schedule_with_slots_options(slim)).filter(Schedule.id == schedule_id).first()
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     return schedule
 
-@router.get("/active/{year}", response_model=schemas.ScheduleWithSlots)
-def get_active_schedule(year: str, db: Session = Depends(get_db)):
+@router.get("/{schedule_id}/grid", response_model=schemas.ScheduleGrid, dependencies=[Depends(schedule_etag)])
+def get_schedule_grid(schedule_id: int, db: Session = Depends(get_db)):
+    """Get a schedule as a compact week grid.
+
+    Lighter alternative to GET /{schedule_id}: every class is sent once, and
+    cells only reference it by id.
+    """
+    grid = build_grid(db, schedule_id)
+    if grid is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return grid
+
+@router.get("/active/{year}", response_model=schemas.ScheduleWithSlots, dependencies=[Depends(global_etag)])
+def get_active_schedule(
+    year: str,
+    slim: bool = Query(False, description="Omit nested user objects"),
+    db: Session = Depends(get_db)
+):
     """Get the active schedule for a year"""
-    schedule = db.query(Schedule).filter(
+    schedule = db.query(Schedule).options(*schedule_with_slots_options(slim)).filter(
         Schedule.year == year,
         Schedule.is_active == True
     ).first()
@@ -39,13 +149,14 @@ def get_active_schedule(year: str, db: Session = Depends(get_db)):
 def create_schedule(schedule_data: schemas.ScheduleCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     """Create a new schedule"""
     # Deactivate other schedules for the same year
-    db.query(Schedule).filter(Schedule.year == schedule_data.year).update({"is_active": False})
+    deactivate_year(db, schedule_data.year)
 
     # Add user_id from the authenticated user
     db_schedule = Schedule(**schedule_data.dict(), user_id=current_user.id, is_active=True)
     db.add(db_schedule)
     db.commit()
     db.refresh(db_schedule)
+    invalidate_schedule_index()  # Other users' schedules for the year were deactivated too
     return db_schedule
 
 @router.put("/{schedule_id}/activate", response_model=schemas.Schedule)
@@ -56,11 +167,12 @@ def activate_schedule(schedule_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Schedule not found")
     
     # Deactivate other schedules for the same year
-    db.query(Schedule).filter(Schedule.year == schedule.year).update({"is_active": False})
+    deactivate_year(db, schedule.year)
     
     schedule.is_active = True
     db.commit()
     db.refresh(schedule)
+    invalidate_schedule_index()
     return schedule
 
 @router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -72,49 +184,130 @@ def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
     
     db.delete(schedule)
     db.commit()
+    invalidate_schedule_index(schedule.user_id)
     return None
 
+@router.put("/{schedule_id}/grid", response_model=schemas.ScheduleGrid)
+def replace_schedule_grid(
+    schedule_id: int,
+    grid_data: schemas.ScheduleGridUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Replace all slots of a schedule in one request.
+
+    The submitted cells are diffed against the existing slots by
+    (day, slot_number): new cells are inserted, changed ones updated and
+    missing ones deleted, in one transaction. Returns the resulting grid.
+    """
+    conflicts = find_conflicts(grid_data.slots)
+    if conflicts:
+        raise_conflicts(conflicts)
+    
+    with locked_schedule(db, schedule_id) as schedule:
+        if not schedule or schedule.user_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        
+        class_ids = {slot.class_id for slot in grid_data.slots if slot.class_id is not None}
+        if class_ids:
+            owned = {class_id for (class_id,) in db.query(Class.id).filter(
+                Class.id.in_(class_ids),
+                Class.user_id == current_user.id
+            )}
+            if owned != class_ids:
+                raise HTTPException(status_code=404, detail=f"Class not found: {min(class_ids - owned)}")
+        
+        replace_grid(db, schedule, grid_data.slots)
+        db.commit()
+    invalidate_schedule_index(current_user.id)
+    return build_grid(db, schedule_id)
+
+@router.post("/{schedule_id}/grid/validate", response_model=schemas.GridValidation)
+def validate_schedule_grid(
+    schedule_id: int,
+    grid_data: schemas.ScheduleGridUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Check a whole grid (e.g. an imported timetable) without saving it.
+
+    Reports slots that end before they start, slot numbers used twice on a
+    day and overlapping times, as PUT /grid would reject them.
+    """
+    schedule = db.query(Schedule).filter(
+        Schedule.id == schedule_id,
+        Schedule.user_id == current_user.id
+    ).first()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    conflicts = describe_conflicts(find_conflicts(grid_data.slots))
+    return {"valid": not conflicts, "conflicts": conflicts}
+
 # Schedule Slots endpoints
-@router.get("/{schedule_id}/slots", response_model=List[schemas.ScheduleSlot])
-def get_schedule_slots(schedule_id: int, db: Session = Depends(get_db)):
+@router.get("/{schedule_id}/slots", response_model=List[schemas.ScheduleSlot], dependencies=[Depends(schedule_etag)])
+def get_schedule_slots(
+    schedule_id: int,
+    slim: bool = Query(False, description="Omit nested user objects"),
+    db: Session = Depends(get_db)
+):
     """Get all slots for a schedule"""
     schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    slots = db.query(ScheduleSlot).filter(ScheduleSlot.schedule_id == schedule_id).all()
+    slots = db.query(ScheduleSlot).options(*schedule_slot_options(slim)).filter(
+        ScheduleSlot.schedule_id == schedule_id
+    ).all()
     return slots
 
 @router.post("/{schedule_id}/slots", response_model=schemas.ScheduleSlot, status_code=status.HTTP_201_CREATED)
 def create_schedule_slot(schedule_id: int, slot_data: schemas.ScheduleSlotCreate, db: Session = Depends(get_db)):
-    """Create a new schedule slot"""
-    schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
-    if not schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
-    
-    slot_data.schedule_id = schedule_id
-    db_slot = ScheduleSlot(**slot_data.dict())
-    db.add(db_slot)
-    db.commit()
+    """Create a new schedule slot (rejected if it clashes with another slot that day)"""
+    with locked_schedule(db, schedule_id) as schedule:
+        if not schedule:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        
+        slot_data.schedule_id = schedule_id
+        db_slot = ScheduleSlot(**slot_data.dict())
+        conflicts = conflicts_with(db, schedule_id, db_slot)
+        if conflicts:
+            raise_conflicts(conflicts)
+        db.add(db_slot)
+        db.commit()
     db.refresh(db_slot)
+    slot_changed(schedule.user_id, db_slot)
     return db_slot
 
 @router.put("/{schedule_id}/slots/{slot_id}", response_model=schemas.ScheduleSlot)
 def update_schedule_slot(schedule_id: int, slot_id: int, slot_data: schemas.ScheduleSlotUpdate, db: Session = Depends(get_db)):
-    """Update a schedule slot"""
-    slot = db.query(ScheduleSlot).filter(
-        ScheduleSlot.id == slot_id,
-        ScheduleSlot.schedule_id == schedule_id
-    ).first()
-    if not slot:
-        raise HTTPException(status_code=404, detail="Schedule slot not found")
-    
-    update_data = slot_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(slot, field, value)
-    
-    db.commit()
+    """Update a schedule slot (rejected if new times clash with another slot that day)"""
+    with locked_schedule(db, schedule_id):
+        slot = db.query(ScheduleSlot).filter(
+            ScheduleSlot.id == slot_id,
+            ScheduleSlot.schedule_id == schedule_id
+        ).first()
+        if not slot:
+            raise HTTPException(status_code=404, detail="Schedule slot not found")
+        
+        update_data = slot_data.dict(exclude_unset=True)
+        if "start_time" in update_data or "end_time" in update_data:
+            candidate = SimpleNamespace(
+                day=slot.day,
+                slot_number=slot.slot_number,
+                start_time=update_data.get("start_time") or slot.start_time,
+                end_time=update_data.get("end_time") or slot.end_time
+            )
+            conflicts = conflicts_with(db, schedule_id, candidate, exclude_slot_id=slot.id)
+            if conflicts:
+                raise_conflicts(conflicts)
+        
+        for field, value in update_data.items():
+            setattr(slot, field, value)
+        
+        db.commit()
     db.refresh(slot)
+    slot_changed(slot.schedule.user_id, slot)
     return slot
 
 @router.delete("/{schedule_id}/slots/{slot_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -127,6 +320,8 @@ def delete_schedule_slot(schedule_id: int, slot_id: int, db: Session = Depends(g
     if not slot:
         raise HTTPException(status_code=404, detail="Schedule slot not found")
     
+    user_id = slot.schedule.user_id
     db.delete(slot)
     db.commit()
+    slot_deleted(user_id, schedule_id, slot_id)
     return None
\ No newline at end of file
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session, noload
+
+from ..models.database import get_db
+from ..models.homework import Homework
+from ..models.classes import Class
+from ..models.notes import Note
+from ..models.schedule import Schedule, ScheduleSlot
+from ..models.sync_change import SyncChange, SyncEntity
+from ..models.user import User
+from ..auth import get_current_user
+from .. import schemas
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+# entity -> (model, response schema of its own endpoints)
+SYNC_MODELS = {
+    SyncEntity.HOMEWORK: (Homework, schemas.Homework),
+    SyncEntity.CLASS: (Class, schemas.Class),
+    SyncEntity.NOTE: (Note, schemas.Note),
+    SyncEntity.SCHEDULE_SLOT: (ScheduleSlot, schemas.ScheduleSlot),
+    SyncEntity.SCHEDULE: (Schedule, schemas.Schedule),
+}
+
+@router.get("/changes", response_model=schemas.SyncChanges)
+def get_changes(
+    since: int = Query(0, ge=0, description="Cursor from the previous call; 0 for a full sync"),
+    limit: int = Query(500, ge=1, le=5000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Homework, classes, notes, schedules and their slots changed since a cursor - user-specific.
+
+    Each record appears at most once, at its latest change; deleted records
+    come back as tombstones (`deleted`, no data). Call again with `cursor`
+    while `has_more` is set. One query for the log plus one per entity type.
+    """
+    rows = db.query(SyncChange).filter(
+        SyncChange.user_id == current_user.id,
+        SyncChange.seq > since
+    ).order_by(SyncChange.seq).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    ids = {}
+    for row in rows:
+        if not row.deleted:
+            ids.setdefault(row.entity, []).append(row.entity_id)
+    records = {}
+    for entity, entity_ids in ids.items():
+        model, schema = SYNC_MODELS[entity]
+        for record in db.query(model).options(noload("*")).filter(model.id.in_(entity_ids)):
+            records[(entity, record.id)] = schema.model_validate(record).model_dump(mode="json")
+
+    changes = []
+    for row in rows:
+        data = records.get((row.entity, row.entity_id))
+        changes.append(schemas.SyncChangeItem(
+            seq=row.seq,
+            entity=row.entity.value,
+            id=row.entity_id,
+            # Gone since it was logged; a later tombstone is on its way
+            deleted=row.deleted or data is None,
+            data=data
+        ))
+
+    return schemas.SyncChanges(
+        changes=changes,
+        cursor=rows[-1].seq if rows else since,
+        has_more=has_more
+    )
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime, date, time
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 
 # User schemas
 class UserBase(BaseModel):
@@ -68,6 +68,10 @@ class ClassType(str, Enum):
     BIOLOGY = "BIOLOGY"
     OTHER = "OTHER"
 
+class HomeworkSort(str, Enum):
+    DUE = "due"          # due_date, due_time, id (soonest first)
+    UPDATED = "updated"  # updated_at, id (most recent first)
+
 class EducationLevel(str, Enum):
     # International grades (standardized backend storage)
     GRADE_1 = "GRADE_1"
@@ -83,6 +87,11 @@ class EducationLevel(str, Enum):
     GRADE_11 = "GRADE_11"
     GRADE_12 = "GRADE_12"
 
+class DriveStatus(str, Enum):
+    PENDING = "PENDING"
+    READY = "READY"
+    FAILED = "FAILED"
+
 # Class schemas
 class ClassBase(BaseModel):
     name: str = Field(..., max_length=100)
@@ -150,6 +159,40 @@ class ScheduleSlotUpdate(BaseModel):
     end_time: Optional[time] = None
     slot_type: Optional[SlotType] = None
 
+class GridSlot(ScheduleSlotBase):
+    class_id: Optional[int] = None
+
+class ScheduleGridUpdate(BaseModel):
+    # The complete week: cells left out are deleted
+    slots: List[GridSlot] = Field(..., max_length=len(WeekDay) * 8)
+
+class SlotConflict(BaseModel):
+    kind: str  # invalid_time, duplicate or overlap
+    day: WeekDay
+    slot_numbers: List[int]
+    message: str
+
+class GridValidation(BaseModel):
+    valid: bool
+    conflicts: List[SlotConflict] = []
+
+class GridClass(BaseModel):
+    id: int
+    name: str
+    teacher: str
+    color: str
+    class_type: ClassType
+
+# Compact week grid: each class once, then grid[day][slot_number - 1] =
+# (slot id, class id, start time, end time, slot type), or null for an empty cell
+GridCell = Tuple[int, Optional[int], time, time, SlotType]
+
+class ScheduleGrid(BaseModel):
+    schedule_id: int
+    days: List[WeekDay]
+    classes: Dict[int, GridClass] = {}
+    grid: List[List[Optional[GridCell]]] = []
+
 class ScheduleSlot(ScheduleSlotBase):
     id: int
     schedule_id: int
@@ -210,6 +253,36 @@ class DashboardSummary(BaseModel):
     overdue: int
     completed_this_week: int
 
+# Dashboard page: summary plus the homework lists, in one response
+class HomeworkBuckets(BaseModel):
+    summary: DashboardSummary
+    overdue: List[Homework] = []    # Past their due time
+    due_today: List[Homework] = []  # Due today (user's local day), including ones already past their time
+    upcoming: List[Homework] = []   # Due from today through the next `days` days
+
+# Bulk homework operations
+class HomeworkBulkAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    COMPLETE = "complete"
+    REOPEN = "reopen"
+    DELETE = "delete"
+
+class HomeworkBulkOperation(BaseModel):
+    action: HomeworkBulkAction
+    id: Optional[int] = None  # Target homework; required for every action but create
+    homework: Optional[HomeworkCreate] = None  # For create
+    changes: Optional[HomeworkUpdate] = None  # For update
+
+class HomeworkBulkRequest(BaseModel):
+    # Applied all-or-nothing; each homework may be targeted once
+    operations: List[HomeworkBulkOperation] = Field(..., min_length=1, max_length=1000)
+
+class HomeworkBulkResult(BaseModel):
+    created: List[Homework] = []  # In request order; nested objects are omitted
+    updated: List[Homework] = []  # Updated, completed and reopened homework
+    deleted: List[int] = []
+
 # Notes schemas
 class NoteBase(BaseModel):
     title: str = Field(..., max_length=200)
@@ -246,6 +319,7 @@ class Note(NoteBase):
     id: int
     user_id: int
     year: str  # Automatically determined from user's classes
+    drive_status: Optional[DriveStatus] = None  # PENDING while the Drive file is resolved in the background
     created_at: datetime
     updated_at: datetime
     user: Optional[User] = None
@@ -253,6 +327,14 @@ class Note(NoteBase):
     class Config:
         from_attributes = True
 
+class NoteDriveStatus(BaseModel):
+    note_id: int
+    drive_status: Optional[DriveStatus] = None
+    google_drive_file_id: Optional[str] = None
+    google_drive_file_url: Optional[str] = None
+    google_drive_file_name: Optional[str] = None
+    google_drive_mime_type: Optional[str] = None
+
 # Public notes response (excludes user details for privacy)
 class PublicNote(BaseModel):
     id: int
@@ -272,4 +354,56 @@ class PublicNote(BaseModel):
     google_drive_mime_type: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Public notes facet counts
+class FacetCount(BaseModel):
+    value: Optional[str] = None  # None = not set (education level / school)
+    count: int
+
+class PublicNoteFacets(BaseModel):
+    total: int
+    class_type: List[FacetCount] = []
+    education_level: List[FacetCount] = []
+    year: List[FacetCount] = []
+    school: List[FacetCount] = []
+
+# "Now / next" schemas
+class CurrentSlot(BaseModel):
+    slot_id: int
+    day: WeekDay
+    slot_number: int
+    start_time: time
+    end_time: time
+    slot_type: SlotType
+    class_: Optional[GridClass] = None
+    homework: List[Homework] = []  # Not completed and not yet due, soonest first
+
+class NowNext(BaseModel):
+    schedule_id: Optional[int] = None
+    timezone: str
+    local_time: datetime
+    current: Optional[CurrentSlot] = None
+    next: Optional[CurrentSlot] = None
+    next_starts_in_minutes: Optional[int] = None
+
+# Delta sync schemas
+class SyncEntity(str, Enum):
+    HOMEWORK = "HOMEWORK"
+    CLASS = "CLASS"
+    NOTE = "NOTE"
+    SCHEDULE_SLOT = "SCHEDULE_SLOT"
+    SCHEDULE = "SCHEDULE"
+
+class SyncChangeItem(BaseModel):
+    seq: int
+    entity: SyncEntity
+    id: int
+    deleted: bool = False
+    # The record as its own endpoint returns it, without nested objects; None when deleted
+    data: Optional[dict] = None
+
+class SyncChanges(BaseModel):
+    changes: List[SyncChangeItem] = []
+    cursor: int  # Pass as `since` on the next call
+    has_more: bool = False
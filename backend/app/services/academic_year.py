@@ -0,0 +1,35 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.classes import Class
+
+# user_id -> most common year among the user's classes. Cleared by the class
+# write handlers; other workers catch up within the TTL.
+academic_year_cache = TTLCache(
+    "academic_year", settings.academic_year_cache_max_entries, settings.academic_year_cache_ttl_seconds
+)
+
+def get_user_current_year(user_id: int, db: Session) -> str:
+    """Get the most common year from user's classes"""
+    year = academic_year_cache.get(user_id)
+    if year is not None:
+        return year
+    
+    # Ties go to the latest year
+    year = db.query(Class.year).filter(Class.user_id == user_id).group_by(Class.year).order_by(
+        func.count(Class.id).desc(), Class.year.desc()
+    ).limit(1).scalar()
+    if year is None:
+        # Default to current academic year if no classes
+        current_year = datetime.now().year
+        year = f"{current_year}-{current_year + 1}"
+    
+    academic_year_cache.set(user_id, year)
+    return year
+
+def invalidate_user_year(user_id: int) -> None:
+    """Call after creating, deleting or changing the year of one of the user's classes"""
+    academic_year_cache.pop(user_id)
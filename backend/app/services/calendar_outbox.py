@@ -0,0 +1,274 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, insert, select, update
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import logging
+import threading
+
+from ..config import settings
+from ..models.database import SessionLocal
+from ..models.calendar_outbox import CalendarOutbox, OutboxOperation, OutboxStatus
+from ..models.homework import Homework
+from ..models.user import User
+from .google_calendar import GoogleCalendarService
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = (OutboxStatus.PENDING, OutboxStatus.PROCESSING)
+
+def enqueue_calendar_operation(
+    db: Session,
+    user: User,
+    operation: OutboxOperation,
+    homework_id: Optional[int] = None,
+    event_id: Optional[str] = None
+) -> Optional[CalendarOutbox]:
+    """Record a calendar side effect in the caller's transaction (no-op without Google tokens)"""
+    if not user.google_access_token:
+        return None
+
+    entry = CalendarOutbox(
+        user_id=user.id,
+        homework_id=homework_id,
+        operation=operation,
+        event_id=event_id,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(entry)
+    return entry
+
+def enqueue_calendar_operations(
+    db: Session,
+    user: User,
+    operations: List[Tuple[OutboxOperation, Optional[int], Optional[str]]]
+) -> None:
+    """Record many (operation, homework_id, event_id) side effects with one INSERT, in order"""
+    if not user.google_access_token or not operations:
+        return
+
+    now = datetime.utcnow()
+    db.execute(insert(CalendarOutbox), [
+        {
+            "user_id": user.id,
+            "homework_id": homework_id,
+            "operation": operation,
+            "event_id": event_id,
+            "status": OutboxStatus.PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+        }
+        for operation, homework_id, event_id in operations
+    ])
+
+class CalendarSyncError(Exception):
+    """A calendar operation failed and should be retried"""
+
+class CalendarOutboxWorker:
+    """Drains calendar_outbox with a thread pool.
+
+    Entries for the same user are applied strictly in order: only the oldest
+    open entry of each user is eligible, and a user has at most one entry in
+    flight. Failures are retried with exponential backoff up to
+    `max_attempts`, after which the entry is marked FAILED.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        batch_size: int = 50,
+        max_attempts: int = 8,
+        base_backoff: float = 5.0,
+        max_backoff: float = 3600.0,
+        lock_timeout: float = 300.0
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.lock_timeout = lock_timeout
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._in_flight = set()  # user ids with an entry being processed
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="calendar-outbox")
+        self._thread = threading.Thread(target=self._run, name="calendar-outbox-dispatcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Calendar outbox worker started with {self.workers} workers")
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        self._thread = None
+        self._executor = None
+
+    def notify(self):
+        """Wake the dispatcher early (e.g. right after a commit that enqueued work)"""
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                dispatched = self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Calendar outbox dispatch failed: {e}")
+                dispatched = 0
+            if not dispatched:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def dispatch_once(self) -> int:
+        """Claim the due head-of-line entry of each idle user and submit it to the pool"""
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            # Recover entries left PROCESSING by a crashed worker
+            db.execute(
+                update(CalendarOutbox)
+                .where(
+                    CalendarOutbox.status == OutboxStatus.PROCESSING,
+                    CalendarOutbox.locked_at < now - timedelta(seconds=self.lock_timeout)
+                )
+                .values(status=OutboxStatus.PENDING, locked_at=None)
+            )
+            db.commit()
+
+            heads = select(func.min(CalendarOutbox.id)).where(
+                CalendarOutbox.status.in_(OPEN_STATUSES)
+            ).group_by(CalendarOutbox.user_id)
+
+            with self._lock:
+                busy = set(self._in_flight)
+            candidates = db.query(CalendarOutbox.id, CalendarOutbox.user_id).filter(
+                CalendarOutbox.id.in_(heads),
+                CalendarOutbox.status == OutboxStatus.PENDING,
+                CalendarOutbox.next_attempt_at <= now
+            ).order_by(CalendarOutbox.id).limit(self.batch_size).all()
+
+            dispatched = 0
+            for entry_id, user_id in candidates:
+                if user_id in busy:
+                    continue
+                # Claim atomically so several processes can share the table
+                claimed = db.execute(
+                    update(CalendarOutbox)
+                    .where(CalendarOutbox.id == entry_id, CalendarOutbox.status == OutboxStatus.PENDING)
+                    .values(status=OutboxStatus.PROCESSING, locked_at=now)
+                ).rowcount
+                db.commit()
+                if not claimed:
+                    continue
+                with self._lock:
+                    self._in_flight.add(user_id)
+                self._executor.submit(self._process_and_release, entry_id, user_id)
+                dispatched += 1
+            return dispatched
+        finally:
+            db.close()
+
+    def _process_and_release(self, entry_id: int, user_id: int):
+        try:
+            self.process(entry_id)
+        finally:
+            with self._lock:
+                self._in_flight.discard(user_id)
+            self._wakeup.set()
+
+    def process(self, entry_id: int):
+        """Apply one claimed entry and record the outcome"""
+        db = self.session_factory()
+        try:
+            entry = db.get(CalendarOutbox, entry_id)
+            if entry is None:
+                return
+            try:
+                self._apply(db, entry)
+                entry.status = OutboxStatus.DONE
+                entry.last_error = None
+            except Exception as e:
+                db.rollback()
+                entry = db.get(CalendarOutbox, entry_id)
+                entry.attempts += 1
+                entry.last_error = str(e)[:1000]
+                if entry.attempts >= self.max_attempts:
+                    entry.status = OutboxStatus.FAILED
+                    logger.error(f"Giving up on calendar outbox entry {entry_id} after {entry.attempts} attempts: {e}")
+                else:
+                    delay = min(self.max_backoff, self.base_backoff * 2 ** (entry.attempts - 1))
+                    entry.status = OutboxStatus.PENDING
+                    entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                    logger.warning(f"Calendar outbox entry {entry_id} failed (attempt {entry.attempts}), retrying in {delay:.0f}s: {e}")
+            entry.locked_at = None
+            db.commit()
+        finally:
+            db.close()
+
+    def _apply(self, db: Session, entry: CalendarOutbox):
+        user = db.get(User, entry.user_id)
+        if not user or not user.google_access_token:
+            logger.info(f"Skipping calendar outbox entry {entry.id}: user has no Google access")
+            return
+
+        with GoogleCalendarService(user) as calendar_service:
+            self._call_calendar(db, entry, calendar_service)
+
+    def _call_calendar(self, db: Session, entry: CalendarOutbox, calendar_service: GoogleCalendarService):
+        if entry.operation == OutboxOperation.DELETE:
+            event_id = entry.event_id or self._created_event_id(db, entry.homework_id)
+            if event_id and not calendar_service.delete_homework_event(event_id):
+                raise CalendarSyncError(f"Failed to delete calendar event {event_id}")
+            return
+
+        homework = db.query(Homework).options(joinedload(Homework.class_)).filter(
+            Homework.id == entry.homework_id
+        ).first()
+
+        if entry.operation == OutboxOperation.CREATE:
+            if homework is None or homework.google_calendar_event_id:
+                return
+            event_id = calendar_service.create_homework_event(homework)
+            if not event_id:
+                raise CalendarSyncError(f"Failed to create calendar event for homework {homework.id}")
+            homework.google_calendar_event_id = event_id
+            entry.event_id = event_id
+
+        elif entry.operation == OutboxOperation.UPDATE:
+            if homework is None or not homework.google_calendar_event_id:
+                return
+            if not calendar_service.update_homework_event(homework):
+                raise CalendarSyncError(f"Failed to update calendar event for homework {homework.id}")
+
+    def _created_event_id(self, db: Session, homework_id: Optional[int]) -> Optional[str]:
+        """Event id recorded by an earlier CREATE entry (homework deleted before its id was read)"""
+        if homework_id is None:
+            return None
+        return db.query(CalendarOutbox.event_id).filter(
+            CalendarOutbox.homework_id == homework_id,
+            CalendarOutbox.operation == OutboxOperation.CREATE,
+            CalendarOutbox.status == OutboxStatus.DONE
+        ).order_by(CalendarOutbox.id.desc()).limit(1).scalar()
+
+calendar_outbox_worker = CalendarOutboxWorker(
+    workers=settings.calendar_outbox_workers,
+    poll_interval=settings.calendar_outbox_poll_seconds,
+    max_attempts=settings.calendar_outbox_max_attempts
+)
@@ -0,0 +1,144 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.database import SessionLocal
+from ..models.drive_file_cache import DriveFileCache
+from ..models.notes import Note, DriveStatus
+from ..models.user import User
+from ..models.sync_change import SyncEntity
+from .google_drive import GoogleDriveService
+from .public_notes_cache import invalidate_public_notes
+from .sync_changes import record_bulk_changes
+
+logger = logging.getLogger(__name__)
+
+# (user_id, file_id) -> file info dict, or {} when the user has no access.
+# Backed by the drive_file_cache table so entries survive restarts and are
+# shared between workers.
+drive_file_cache = TTLCache("drive_files", settings.drive_cache_max_entries, settings.drive_cache_ttl_seconds)
+
+_NO_ACCESS = {}
+
+def _row_to_info(row: DriveFileCache) -> dict:
+    if not row.accessible:
+        return _NO_ACCESS
+    return {
+        'id': row.file_id,
+        'name': row.name,
+        'mimeType': row.mime_type,
+        'webViewLink': row.web_view_link,
+        'is_public': row.is_public,
+    }
+
+def _store(db: Session, user_id: int, file_id: str, info: dict) -> None:
+    values = {
+        'user_id': user_id,
+        'file_id': file_id,
+        'accessible': bool(info),
+        'name': info.get('name'),
+        'mime_type': info.get('mimeType'),
+        'web_view_link': info.get('webViewLink'),
+        'is_public': info.get('is_public'),
+        'fetched_at': datetime.utcnow(),
+    }
+    # Upsert, so two requests caching the same file at once don't conflict
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(DriveFileCache).values(**values)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=['user_id', 'file_id'],
+        set_={column: statement.excluded[column] for column in values if column not in ('user_id', 'file_id')}
+    ))
+    drive_file_cache.set((user_id, file_id), info)
+
+def get_drive_file(
+    db: Session, user: User, file_id: str, refresh: bool = False, recheck_no_access: bool = False
+) -> Optional[dict]:
+    """Metadata of a Drive file as seen by the user, or None if they can't access it.
+
+    Served from memory, then from drive_file_cache, and only then from one
+    Drive files.get call. `refresh=True` always asks Drive;
+    `recheck_no_access=True` asks Drive when the cache says the file is
+    inaccessible (the user may have fixed its sharing since). Cache rows are
+    written in the caller's transaction; the caller commits.
+    """
+    key = (user.id, file_id)
+    if not refresh:
+        info = drive_file_cache.get(key)
+        if info is None:
+            row = db.get(DriveFileCache, key)
+            if row and row.fetched_at > datetime.utcnow() - timedelta(seconds=settings.drive_cache_ttl_seconds):
+                info = _row_to_info(row)
+                drive_file_cache.set(key, info)
+        if info or (info is not None and not recheck_no_access):
+            return info or None
+
+    with GoogleDriveService(user) as drive_service:
+        info = drive_service.fetch_file(file_id) or _NO_ACCESS
+    _store(db, user.id, file_id, info)
+    return info or None
+
+def ensure_public(db: Session, user: User, file_id: str, info: dict) -> bool:
+    """Make the file viewable by anyone with the link, skipping Drive if it already is"""
+    if info.get('is_public'):
+        return True
+
+    with GoogleDriveService(user) as drive_service:
+        if info.get('is_public') is None:
+            # Sharing state unknown: check the permissions before adding one
+            shared = drive_service.make_file_shareable(file_id)
+        else:
+            shared = drive_service.share_publicly(file_id)
+    if shared:
+        _store(db, user.id, file_id, dict(info, is_public=True))
+    return shared
+
+def enrich_note_drive_file(note_id: int, file_id: str) -> None:
+    """Background job: resolve a note's Drive file and share it if the note is public.
+
+    Runs after the response is sent, with its own session. The result is only
+    written if the note still points at `file_id` and is still PENDING, so a
+    newer edit is never overwritten by an older job.
+    """
+    db = SessionLocal()
+    try:
+        note = db.get(Note, note_id)
+        if note is None or note.drive_status != DriveStatus.PENDING or note.google_drive_file_id != file_id:
+            return
+        user = db.get(User, note.user_id)
+
+        values = {'drive_status': DriveStatus.FAILED}
+        try:
+            # Saving a note is when users retry after fixing sharing, so don't trust a cached "no access"
+            file_info = get_drive_file(db, user, file_id, recheck_no_access=True)
+            if file_info:
+                if note.is_public and not ensure_public(db, user, file_id, file_info):
+                    logger.warning(f"Could not make file {file_id} publicly shareable for public note {note_id}")
+                values = {
+                    'drive_status': DriveStatus.READY,
+                    'google_drive_file_url': file_info.get('webViewLink'),
+                    'google_drive_file_name': note.google_drive_file_name or file_info.get('name'),
+                    'google_drive_mime_type': file_info.get('mimeType'),
+                }
+            else:
+                logger.warning(f"Invalid or inaccessible Google Drive file {file_id} on note {note_id}")
+        except Exception as e:
+            logger.warning(f"Error resolving Google Drive file {file_id} for note {note_id}: {e}")
+
+        result = db.execute(
+            update(Note)
+            .where(Note.id == note_id, Note.google_drive_file_id == file_id, Note.drive_status == DriveStatus.PENDING)
+            .values(**values)
+        )
+        if result.rowcount:
+            record_bulk_changes(db, SyncEntity.NOTE, note.user_id, [note_id])
+        db.commit()
+        if result.rowcount and note.is_public:
+            invalidate_public_notes()
+    finally:
+        db.close()
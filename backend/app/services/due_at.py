@@ -0,0 +1,29 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from datetime import time
+from typing import Optional
+
+from ..models.homework import Homework
+from ..models.sync_change import SyncEntity
+from ..timezones import to_utc
+from .sync_changes import record_bulk_changes
+
+def recompute_due_at(db: Session, user_id: int, timezone_name: Optional[str]) -> int:
+    """Re-derive due_at of all the user's homework after their timezone changed.
+
+    One SELECT and one executemany UPDATE in the caller's transaction; the
+    caller commits. Returns the number of homework items updated.
+    """
+    rows = db.execute(
+        select(Homework.id, Homework.due_date, Homework.due_time).where(Homework.user_id == user_id)
+    ).all()
+    if not rows:
+        return 0
+
+    db.execute(update(Homework), [
+        {"id": row.id, "due_at": to_utc(row.due_date, row.due_time or time(23, 59), timezone_name)}
+        for row in rows
+    ])
+    # Due-today and overdue lists change, so ETags and delta sync must move too
+    record_bulk_changes(db, SyncEntity.HOMEWORK, user_id, [row.id for row in rows])
+    return len(rows)
@@ -1,20 +1,23 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+from urllib.parse import urljoin
 import logging
 import pytz
 
 from ..models.user import User
 from ..models.homework import Homework
+from .google_clients import PooledGoogleService
 
 logger = logging.getLogger(__name__)
 
-class GoogleCalendarService:
-    def __init__(self, user: User):
-        self.user = user
-        self.service = None
+# Calendar API limit on the number of calls in one batch request
+BATCH_SIZE = 50
+
+class GoogleCalendarService(PooledGoogleService):
+    API = 'calendar'
+    VERSION = 'v3'
         
     def _get_user_timezone(self):
         """Get user's timezone, defaulting to UTC"""
@@ -32,24 +35,117 @@ class GoogleCalendarService:
             # Assume naive datetime is in user's timezone
             return user_tz.localize(dt)
         return dt.astimezone(user_tz)
+    
+    def _event_fields(self, homework: Homework) -> dict:
+        """Event fields derived from the homework (due time in the user's timezone)"""
+        # Combine due date and time, treating as user's local time
+        due_datetime = datetime.combine(homework.due_date, homework.due_time)
         
-    def _build_service(self):
-        """Build Google Calendar service with user credentials"""
-        if not self.user.google_access_token:
-            raise ValueError("User has no Google access token")
-            
+        # Localize to user's timezone
+        due_datetime_localized = self._localize_datetime(due_datetime)
+        
+        # Create event that lasts 1 hour before due time
+        start_time = due_datetime_localized - timedelta(hours=1)
+        
+        # Get timezone string for the user
+        user_timezone = self.user.get_timezone()
+        
+        return {
+            'summary': f'Homework: {homework.title}',
+            'description': f'Class: {homework.class_.name if homework.class_ else "Unknown"}\n'
+                          f'Description: {homework.description or "No description"}\n'
+                          f'Priority: {homework.priority.value}',
+            'start': {
+                'dateTime': start_time.isoformat(),
+                'timeZone': user_timezone,
+            },
+            'end': {
+                'dateTime': due_datetime_localized.isoformat(),
+                'timeZone': user_timezone,
+            },
+        }
+    
+    def _new_event(self, homework: Homework) -> dict:
+        event = self._event_fields(homework)
+        event['reminders'] = {
+            'useDefault': False,
+            'overrides': [
+                {'method': 'email', 'minutes': 24 * 60},  # 24 hours before
+                {'method': 'popup', 'minutes': 60},        # 1 hour before
+            ],
+        }
+        return event
+    
+    def _new_batch(self, callback) -> BatchHttpRequest:
         from ..config import settings
-            
-        credentials = Credentials(
-            token=self.user.google_access_token,
-            refresh_token=self.user.google_refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
-        )
         
-        self.service = build('calendar', 'v3', credentials=credentials)
-        return self.service
+        if settings.google_calendar_api_endpoint:
+            # The discovery document hard-codes the batch URL on www.googleapis.com
+            return BatchHttpRequest(
+                callback=callback,
+                batch_uri=urljoin(settings.google_calendar_api_endpoint, "/batch/calendar/v3")
+            )
+        return self.service.new_batch_http_request(callback=callback)
+    
+    def batch_sync(
+        self,
+        creates: List[Homework] = (),
+        delete_event_ids: List[str] = ()
+    ) -> List[dict]:
+        """Apply event inserts and deletes in batch requests of up to BATCH_SIZE calls.
+
+        Returns one result per operation, in input order:
+        `{"operation", "homework_id", "event_id", "success", "status", "error"}`.
+        A failed call only fails its own item; a failed batch fails every item in it.
+        """
+        if not self.service:
+            self._build_service()
+        
+        events = self.service.events()
+        operations = []
+        for homework in creates:
+            operations.append((
+                {"operation": "create", "homework_id": homework.id, "event_id": None},
+                events.insert(calendarId='primary', body=self._new_event(homework))
+            ))
+        for event_id in delete_event_ids:
+            operations.append((
+                {"operation": "delete", "homework_id": None, "event_id": event_id},
+                events.delete(calendarId='primary', eventId=event_id)
+            ))
+        
+        results = [dict(result, success=False, status=None, error=None) for result, _ in operations]
+        
+        def handle_response(request_id, response, exception):
+            result = results[int(request_id)]
+            if exception is None:
+                result["success"] = True
+                result["status"] = 200
+                if result["operation"] == "create":
+                    result["event_id"] = response.get("id")
+                return
+            result["status"] = exception.resp.status if isinstance(exception, HttpError) else None
+            if result["operation"] == "delete" and result["status"] in (404, 410):
+                # Already gone
+                result["success"] = True
+            else:
+                result["error"] = str(exception)
+        
+        for offset in range(0, len(operations), BATCH_SIZE):
+            batch = self._new_batch(handle_response)
+            for index in range(offset, min(offset + BATCH_SIZE, len(operations))):
+                batch.add(operations[index][1], request_id=str(index))
+            try:
+                batch.execute()
+            except Exception as error:
+                logger.error(f"Calendar batch request failed: {error}")
+                for result in results[offset:offset + BATCH_SIZE]:
+                    if result["status"] is None:
+                        result["error"] = str(error)
+        
+        failed = sum(1 for result in results if not result["success"])
+        logger.info(f"Calendar batch sync for user {self.user.id}: {len(results) - failed} succeeded, {failed} failed")
+        return results
     
     def create_homework_event(self, homework: Homework) -> Optional[str]:
         """Create a Google Calendar event for homework"""
@@ -57,40 +153,9 @@ class GoogleCalendarService:
             if not self.service:
                 self._build_service()
             
-            # Combine due date and time, treating as user's local time
-            due_datetime = datetime.combine(homework.due_date, homework.due_time)
-            
-            # Localize to user's timezone
-            due_datetime_localized = self._localize_datetime(due_datetime)
-            
-            # Create event that lasts 1 hour before due time
-            start_time = due_datetime_localized - timedelta(hours=1)
-            
-            # Get timezone string for the user
+            event = self._new_event(homework)
             user_timezone = self.user.get_timezone()
             
-            event = {
-                'summary': f'Homework: {homework.title}',
-                'description': f'Class: {homework.class_.name if homework.class_ else "Unknown"}\n'
-                              f'Description: {homework.description or "No description"}\n'
-                              f'Priority: {homework.priority.value}',
-                'start': {
-                    'dateTime': start_time.isoformat(),
-                    'timeZone': user_timezone,
-                },
-                'end': {
-                    'dateTime': due_datetime_localized.isoformat(),
-                    'timeZone': user_timezone,
-                },
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},  # 24 hours before
-                        {'method': 'popup', 'minutes': 60},        # 1 hour before
-                    ],
-                },
-            }
-            
             result = self.service.events().insert(calendarId='primary', body=event).execute()
             logger.info(f"Created calendar event {result.get('id')} for homework {homework.id} in timezone {user_timezone}")
             return result.get('id')
@@ -0,0 +1,160 @@
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import threading
+
+from ..config import settings
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Parsed discovery documents, keyed by (api, version). Loaded from the copies
+# bundled with google-api-python-client, so building a client never fetches or
+# re-parses one.
+_discovery_docs: Dict[Tuple[str, str], dict] = {}
+_discovery_lock = threading.Lock()
+
+def discovery_document(api: str, version: str) -> dict:
+    with _discovery_lock:
+        doc = _discovery_docs.get((api, version))
+        if doc is None:
+            content = get_static_doc(api, version)
+            if content is None:
+                raise ValueError(f"No bundled discovery document for {api} {version}")
+            doc = _discovery_docs[(api, version)] = json.loads(content)
+        return doc
+
+def token_fingerprint(user: User) -> str:
+    """Identifies the user's current tokens without keeping them as dict keys"""
+    tokens = f"{user.google_access_token or ''}:{user.google_refresh_token or ''}"
+    return hashlib.sha256(tokens.encode()).hexdigest()[:16]
+
+def build_client(api: str, version: str, user: User):
+    """Build an authorized API client (its own keep-alive HTTP connection)"""
+    if not user.google_access_token:
+        raise ValueError("User has no Google access token")
+
+    credentials = Credentials(
+        token=user.google_access_token,
+        refresh_token=user.google_refresh_token,
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=settings.google_client_id,
+        client_secret=settings.google_client_secret,
+    )
+
+    client_options = None
+    if api == "calendar" and settings.google_calendar_api_endpoint:
+        client_options = {"api_endpoint": settings.google_calendar_api_endpoint}
+
+    # build_from_document only adds default parameters to the document in
+    # place, which is idempotent, so the parsed document can be shared.
+    return build_from_document(
+        discovery_document(api, version),
+        credentials=credentials,
+        client_options=client_options
+    )
+
+class GoogleClientPool:
+    """Process-wide pool of authorized Google API clients.
+
+    Clients wrap an httplib2 connection, which is not thread-safe, so each one
+    is checked out by a single caller at a time (acquire/release). Idle
+    clients are kept per (api, version, user) up to `max_per_user`, for at
+    most `max_users` users in LRU order. Clients built for older tokens are
+    dropped as soon as the user's tokens change.
+    """
+
+    def __init__(self, max_users: int, max_per_user: int):
+        self.max_users = max_users
+        self.max_per_user = max_per_user
+        self.hits = 0
+        self.misses = 0
+        self._idle: "OrderedDict[tuple, Tuple[str, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, api: str, version: str, user: User):
+        key = (api, version, user.id)
+        fingerprint = token_fingerprint(user)
+        with self._lock:
+            entry = self._idle.get(key)
+            if entry and entry[0] != fingerprint:
+                del self._idle[key]
+                entry = None
+            if entry and entry[1]:
+                self._idle.move_to_end(key)
+                self.hits += 1
+                return entry[1].pop()
+            self.misses += 1
+        return build_client(api, version, user)
+
+    def release(self, api: str, version: str, user: User, client) -> None:
+        key = (api, version, user.id)
+        fingerprint = token_fingerprint(user)
+        with self._lock:
+            entry = self._idle.get(key)
+            if entry is None or entry[0] != fingerprint:
+                entry = self._idle[key] = (fingerprint, [])
+            if len(entry[1]) < self.max_per_user:
+                entry[1].append(client)
+            self._idle.move_to_end(key)
+            while len(self._idle) > self.max_users:
+                self._idle.popitem(last=False)
+
+    def evict_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._idle if key[2] == user_id]:
+                del self._idle[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "users": len(self._idle),
+                "idle_clients": sum(len(clients) for _, clients in self._idle.values()),
+            }
+
+google_clients = GoogleClientPool(
+    max_users=settings.google_client_pool_max_users,
+    max_per_user=settings.google_client_pool_per_user
+)
+
+class PooledGoogleService:
+    """Base for services that borrow a client from `google_clients`.
+
+    Use as a context manager so the client goes back to the pool:
+
+        with GoogleDriveService(user) as drive_service:
+            drive_service.fetch_file(file_id)
+    """
+    API: str
+    VERSION: str
+
+    def __init__(self, user: User):
+        self.user = user
+        self.service = None
+
+    def _build_service(self):
+        """Borrow an authorized client for the user from the pool"""
+        self.service = google_clients.acquire(self.API, self.VERSION, self.user)
+        return self.service
+
+    def close(self) -> None:
+        if self.service is not None:
+            google_clients.release(self.API, self.VERSION, self.user, self.service)
+            self.service = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,60 +1,69 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from typing import Optional, Dict, Any
 import logging
 
 from ..models.user import User
+from .google_clients import PooledGoogleService
 
 logger = logging.getLogger(__name__)
 
-class GoogleDriveService:
-    def __init__(self, user: User):
-        self.user = user
-        self.service = None
+class GoogleDriveService(PooledGoogleService):
+    API = 'drive'
+    VERSION = 'v3'
     
-    def _build_service(self):
-        """Build Google Drive service with user credentials"""
-        if not self.user.google_access_token:
-            raise ValueError("User has no Google access token")
-            
-        from ..config import settings
-            
-        credentials = Credentials(
-            token=self.user.google_access_token,
-            refresh_token=self.user.google_refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.google_client_id,
-            client_secret=settings.google_client_secret,
-        )
+    def fetch_file(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Access check, metadata and sharing state in a single files.get call.
+
+        Returns None if the user cannot access the file (403/404); other
+        errors are raised so callers don't cache them. `is_public` is None
+        when the user may not see the file's permissions.
+        """
+        if not self.service:
+            self._build_service()
+        
+        try:
+            file_info = self.service.files().get(
+                fileId=file_id,
+                fields='id,name,mimeType,webViewLink,permissions(type,role)'
+            ).execute()
+        except HttpError as error:
+            if error.resp.status in [403, 404]:
+                logger.info(f"User does not have access to file {file_id}")
+                return None
+            raise
         
-        self.service = build('drive', 'v3', credentials=credentials)
-        return self.service
+        permissions = file_info.get('permissions')
+        return {
+            'id': file_info.get('id'),
+            'name': file_info.get('name'),
+            'mimeType': file_info.get('mimeType'),
+            'webViewLink': file_info.get('webViewLink'),
+            'is_public': None if permissions is None else any(
+                permission.get('type') == 'anyone' and permission.get('role') == 'reader'
+                for permission in permissions
+            ),
+        }
     
-    def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
-        """Get file information from Google Drive"""
+    def share_publicly(self, file_id: str) -> bool:
+        """Add an "anyone with the link" reader permission (caller knows there is none yet)"""
         try:
             if not self.service:
                 self._build_service()
             
-            # Get file metadata
-            file_info = self.service.files().get(
+            self.service.permissions().create(
                 fileId=file_id,
-                fields='id,name,mimeType,webViewLink,permissions,owners'
+                body={'type': 'anyone', 'role': 'reader'}
             ).execute()
             
-            logger.info(f"Retrieved file info for {file_id}: {file_info.get('name')}")
-            return file_info
+            logger.info(f"Made file {file_id} publicly shareable")
+            return True
             
         except HttpError as error:
-            if error.resp.status == 404:
-                logger.error(f"File not found: {file_id}")
-                return None
-            logger.error(f"Failed to get file info for {file_id}: {error}")
-            return None
+            logger.error(f"Failed to make file shareable {file_id}: {error}")
+            return False
         except Exception as error:
-            logger.error(f"Unexpected error getting file info: {error}")
-            return None
+            logger.error(f"Unexpected error making file shareable: {error}")
+            return False
     
     def make_file_shareable(self, file_id: str) -> bool:
         """Make a Google Drive file publicly viewable"""
@@ -92,31 +101,8 @@ class GoogleDriveService:
             logger.error(f"Unexpected error making file shareable: {error}")
             return False
     
-    def verify_file_access(self, file_id: str) -> bool:
-        """Verify that the user has access to the file"""
-        try:
-            if not self.service:
-                self._build_service()
-            
-            # Try to get basic file info - this will fail if user doesn't have access
-            self.service.files().get(
-                fileId=file_id,
-                fields='id'
-            ).execute()
-            
-            return True
-            
-        except HttpError as error:
-            if error.resp.status in [403, 404]:
-                logger.error(f"User does not have access to file {file_id}")
-                return False
-            logger.error(f"Failed to verify file access for {file_id}: {error}")
-            return False
-        except Exception as error:
-            logger.error(f"Unexpected error verifying file access: {error}")
-            return False
-    
-    def extract_file_id_from_url(self, drive_url: str) -> Optional[str]:
+    @staticmethod
+    def extract_file_id_from_url(drive_url: str) -> Optional[str]:
         """Extract Google Drive file ID from various URL formats"""
         import re
         
@@ -0,0 +1,140 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete
+from datetime import datetime, time
+from typing import Dict, Iterable, List
+
+from ..models.homework import Homework, Status
+from ..models.user import User
+from ..models.calendar_outbox import OutboxOperation
+from ..models.sync_change import SyncEntity
+from ..timezones import to_utc
+from .calendar_outbox import enqueue_calendar_operations
+from .sync_changes import record_bulk_changes
+from .user_stats import apply_homework_delta, ensure_user_stats, status_delta
+from .. import schemas
+
+Action = schemas.HomeworkBulkAction
+
+COLUMNS = tuple(Homework.__table__.c)
+
+# Columns an update, complete or reopen may write
+UPDATABLE = ("title", "description", "due_date", "due_time", "priority", "status", "completed_at", "due_at", "updated_at")
+
+# The only field an update may set to null
+NULLABLE_CHANGES = ("description",)
+
+# Changes that are pushed to the Google Calendar event
+CALENDAR_FIELDS = ("title", "description", "due_date", "due_time", "priority")
+
+def load_homework_rows(db: Session, user_id: int, ids: Iterable[int]) -> Dict[int, dict]:
+    """The user's homework rows among `ids` (missing ids are left out), locked until commit"""
+    ids = list(ids)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(*COLUMNS).where(Homework.user_id == user_id, Homework.id.in_(ids)).with_for_update()
+    ).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+def _status(value) -> Status:
+    # Accept both the ORM enum and the API (str) enum
+    return Status(getattr(value, "value", value))
+
+def apply_homework_bulk(
+    db: Session,
+    user: User,
+    operations: List[schemas.HomeworkBulkOperation],
+    targets: Dict[int, dict]
+) -> dict:
+    """Apply validated bulk operations in the caller's transaction; the caller commits.
+
+    `targets` holds the current row of every targeted homework (see
+    load_homework_rows). Writes are one executemany UPDATE, one DELETE ...
+    RETURNING and one executemany INSERT ... RETURNING, then a single
+    counter update, outbox insert and sync log entry per kind. Bulk
+    statements skip the ORM events, so due_at is computed here.
+    Returns the created and updated rows and the deleted ids
+    (see schemas.HomeworkBulkResult).
+    """
+    timezone_name = user.get_timezone()
+    now = datetime.utcnow()
+    delta = {"pending": 0, "completed": 0}
+    calendar = []
+    inserts, updates, delete_ids = [], [], []
+
+    def count(old_status, new_status):
+        for key, value in status_delta(old_status, new_status).items():
+            delta[key] += value
+
+    for operation in operations:
+        if operation.action == Action.CREATE:
+            values = operation.homework.dict()
+            values.update(
+                user_id=user.id,
+                status=Status.PENDING,
+                due_at=to_utc(values["due_date"], values["due_time"] or time(23, 59), timezone_name)
+            )
+            inserts.append(values)
+            count(None, Status.PENDING)
+            continue
+
+        row = targets[operation.id]
+        if operation.action == Action.DELETE:
+            delete_ids.append(row["id"])
+            count(row["status"], None)
+            # With no event id yet, the worker falls back to the id stored by the CREATE entry
+            calendar.append((OutboxOperation.DELETE, row["id"], row["google_calendar_event_id"]))
+            continue
+
+        if operation.action == Action.COMPLETE:
+            changes = {"status": Status.COMPLETED}
+        elif operation.action == Action.REOPEN:
+            changes = {"status": Status.PENDING}
+        else:
+            changes = operation.changes.dict(exclude_unset=True)
+
+        if "status" in changes:
+            changes["status"] = _status(changes["status"])
+            changes["completed_at"] = now if changes["status"] == Status.COMPLETED else None
+            count(row["status"], changes["status"])
+        merged = dict(row, **changes, updated_at=now)
+        if "due_date" in changes or "due_time" in changes:
+            merged["due_at"] = to_utc(merged["due_date"], merged["due_time"] or time(23, 59), timezone_name)
+        if any(field in changes for field in CALENDAR_FIELDS):
+            calendar.append((OutboxOperation.UPDATE, row["id"], None))
+        updates.append(merged)
+
+    # A missing counters row must be backfilled before the bulk writes below,
+    # or the backfill would count them on top of the delta
+    ensure_user_stats(db, user.id)
+    db.flush()
+
+    if updates:
+        # Same keys on every row, so this is a single executemany
+        db.execute(update(Homework), [
+            {"id": row["id"], **{field: row[field] for field in UPDATABLE}} for row in updates
+        ])
+
+    deleted = []
+    if delete_ids:
+        deleted = db.scalars(
+            delete(Homework).where(Homework.id.in_(delete_ids)).returning(Homework.id),
+            execution_options={"synchronize_session": False}
+        ).all()
+
+    created = []
+    if inserts:
+        # Ids are handed out in VALUES order, so sorting by id restores request
+        # order (sort_by_parameter_order would insert row by row on SQLite)
+        created = sorted(
+            (dict(row) for row in db.execute(insert(Homework).returning(*COLUMNS), inserts).mappings()),
+            key=lambda row: row["id"]
+        )
+        calendar += [(OutboxOperation.CREATE, row["id"], None) for row in created]
+
+    apply_homework_delta(db, user.id, **delta)
+    enqueue_calendar_operations(db, user, calendar)
+    record_bulk_changes(db, SyncEntity.HOMEWORK, user.id, deleted, deleted=True)
+    record_bulk_changes(db, SyncEntity.HOMEWORK, user.id, [row["id"] for row in updates + created])
+
+    return {"created": created, "updated": updates, "deleted": deleted}
@@ -0,0 +1,75 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from collections import Counter
+from typing import Optional, Tuple
+
+from ..models.note_facets import PublicNoteFacet
+
+FACETS = ("class_type", "education_level", "year", "school")
+
+FacetKey = Tuple[str, str, str, str]
+
+def _value(value) -> str:
+    # Accept both the ORM enum and the API (str) enum; None is stored as ''
+    return getattr(value, "value", value) or ""
+
+def facet_key(note) -> Optional[FacetKey]:
+    """Facet row a note counts towards, or None if it isn't public"""
+    if not note.is_public:
+        return None
+    return tuple(_value(getattr(note, facet)) for facet in FACETS)
+
+def apply_facet_delta(db: Session, old_key: Optional[FacetKey], new_key: Optional[FacetKey]) -> None:
+    """Move one note from old_key to new_key (None = not counted) in the current transaction"""
+    if old_key == new_key:
+        return
+
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    # Fixed order so concurrent writers lock rows the same way
+    for key, delta in sorted(((old_key, -1), (new_key, 1)), key=lambda item: item[0] or ()):
+        if key is None:
+            continue
+        # Relative upsert so concurrent writers never overwrite each other's increments
+        statement = insert(PublicNoteFacet).values(**dict(zip(FACETS, key)), note_count=delta)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=list(FACETS),
+            set_={"note_count": PublicNoteFacet.note_count + statement.excluded.note_count}
+        ))
+
+def facet_counts(
+    db: Session,
+    class_type: Optional[str] = None,
+    education_level: Optional[str] = None,
+    year: Optional[str] = None,
+    school: Optional[str] = None
+) -> dict:
+    """Public note counts per value of every facet, for notes matching the filters.
+
+    One read of the (small) counts table, aggregated here; the notes table
+    isn't touched. Filters behave like those of the public notes feed.
+    """
+    query = select(PublicNoteFacet).where(PublicNoteFacet.note_count > 0)
+    if class_type:
+        query = query.where(PublicNoteFacet.class_type == class_type)
+    if education_level:
+        query = query.where(PublicNoteFacet.education_level == education_level)
+    if year:
+        query = query.where(PublicNoteFacet.year == year)
+    if school:
+        query = query.where(PublicNoteFacet.school.ilike(f"%{school}%"))
+
+    counts = {facet: Counter() for facet in FACETS}
+    total = 0
+    for row in db.scalars(query):
+        total += row.note_count
+        for facet in FACETS:
+            counts[facet][getattr(row, facet) or None] += row.note_count
+
+    result = {"total": total}
+    for facet in FACETS:
+        result[facet] = [
+            {"value": value, "count": count}
+            for value, count in sorted(counts[facet].items(), key=lambda item: (-item[1], item[0] or ""))
+        ]
+    return result
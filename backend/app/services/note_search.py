@@ -0,0 +1,37 @@
+from sqlalchemy.orm import Query
+from sqlalchemy import column, func, literal_column, table
+from typing import List
+import re
+
+from ..models.notes import Note
+
+# Created by migration 0008. SQLite: FTS5 table (rowid = notes.id) kept in
+# sync by triggers. Postgres: GIN index on exactly this expression.
+notes_fts = table("notes_fts", column("rowid"))
+
+NOTE_SEARCH_VECTOR = literal_column(
+    "setweight(to_tsvector('simple', coalesce(notes.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(notes.google_drive_file_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(notes.school, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(notes.content, '')), 'D')"
+)
+
+# bm25 weights for the FTS5 columns: title, content, school, google_drive_file_name
+FTS_WEIGHTS = (10.0, 1.0, 2.0, 5.0)
+
+def search_terms(text: str) -> List[str]:
+    """Words of a user query; everything else (operators, quotes) is dropped"""
+    return re.findall(r"\w+", text.lower())[:20]
+
+def apply_search(query: Query, terms: List[str], dialect: str) -> Query:
+    """Restrict a Note query to notes matching all terms (prefix match), best match first"""
+    if dialect == "postgresql":
+        ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        return query.filter(NOTE_SEARCH_VECTOR.op("@@")(ts_query)).order_by(
+            func.ts_rank(NOTE_SEARCH_VECTOR, ts_query).desc(), Note.id.desc()
+        )
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    return query.join(notes_fts, notes_fts.c.rowid == Note.id).filter(
+        literal_column("notes_fts").op("MATCH")(match)
+    ).order_by(func.bm25(literal_column("notes_fts"), *FTS_WEIGHTS), Note.id.desc())
@@ -0,0 +1,51 @@
+from fastapi import Request, Response
+from typing import Callable, Hashable, Optional, Tuple
+import hashlib
+
+from ..cache import TTLCache
+from ..config import settings
+from ..pagination import NEXT_CURSOR_HEADER
+
+# Pre-serialized public feed pages: key -> (body, etag, next_cursor).
+# The feed is the same for every visitor, so one entry serves everyone.
+public_notes_cache = TTLCache(
+    "public_notes", settings.public_notes_cache_max_entries, settings.public_notes_cache_ttl_seconds
+)
+
+def invalidate_public_notes() -> None:
+    """Call after any create, update or delete that touches a public note.
+
+    Only clears this process; other workers catch up within the TTL.
+    """
+    public_notes_cache.clear()
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+def cached_json_response(
+    request: Request,
+    key: Hashable,
+    build: Callable[[], Tuple[bytes, Optional[str]]]
+) -> Response:
+    """Serve `key` from the cache, calling `build()` -> (json body, next cursor) on a miss.
+
+    Sends ETag and Cache-Control so browsers and reverse proxies can cache
+    too, and answers a matching If-None-Match with 304.
+    """
+    entry = public_notes_cache.get(key)
+    if entry is None:
+        body, next_cursor = build()
+        entry = (body, _etag(body), next_cursor)
+        public_notes_cache.set(key, entry)
+    body, etag, next_cursor = entry
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.public_notes_cache_ttl_seconds}",
+    }
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
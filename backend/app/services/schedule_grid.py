@@ -0,0 +1,102 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, delete
+from typing import List, Optional
+
+from ..models.classes import Class
+from ..models.schedule import Schedule, ScheduleSlot, WeekDay, SlotType
+from ..models.sync_change import SyncEntity
+from .sync_changes import record_bulk_changes
+from .. import schemas
+
+DAYS = list(WeekDay)
+
+def build_grid(db: Session, schedule_id: int) -> Optional[dict]:
+    """Compact week grid of a schedule (see schemas.ScheduleGrid), or None if it doesn't exist.
+
+    One query: the schedule joined with its slots and their classes.
+    """
+    rows = db.execute(
+        select(
+            Schedule.id.label("schedule_id"),
+            ScheduleSlot.id, ScheduleSlot.day, ScheduleSlot.slot_number, ScheduleSlot.start_time,
+            ScheduleSlot.end_time, ScheduleSlot.slot_type, ScheduleSlot.class_id,
+            Class.name, Class.teacher, Class.color, Class.class_type
+        )
+        .select_from(Schedule)
+        .outerjoin(ScheduleSlot, ScheduleSlot.schedule_id == Schedule.id)
+        .outerjoin(Class, Class.id == ScheduleSlot.class_id)
+        .where(Schedule.id == schedule_id)
+        .order_by(ScheduleSlot.id)
+    ).all()
+    if not rows:
+        return None
+    # A schedule without slots comes back as one row of NULL slot columns
+    rows = [row for row in rows if row.id is not None]
+
+    width = max((row.slot_number for row in rows), default=0)
+    grid = [[None] * width for _ in DAYS]
+    classes = {}
+    for row in rows:
+        grid[DAYS.index(row.day)][row.slot_number - 1] = (
+            row.id, row.class_id, row.start_time, row.end_time, row.slot_type.value
+        )
+        if row.class_id is not None and row.class_id not in classes:
+            classes[row.class_id] = {
+                "id": row.class_id,
+                "name": row.name,
+                "teacher": row.teacher,
+                "color": row.color,
+                "class_type": row.class_type.value,
+            }
+
+    return {
+        "schedule_id": schedule_id,
+        "days": [day.value for day in DAYS],
+        "classes": classes,
+        "grid": grid,
+    }
+
+def replace_grid(db: Session, schedule: Schedule, slots: List[schemas.GridSlot]) -> dict:
+    """Make the schedule's slots exactly `slots`, matched to existing ones by (day, slot_number).
+
+    Returns counts of inserted, updated and deleted slots. Everything is
+    done with three bulk statements in the caller's transaction, plus the
+    sync change log entries; the caller commits.
+    """
+    existing = {}
+    to_delete = []
+    for slot in db.query(ScheduleSlot).filter(ScheduleSlot.schedule_id == schedule.id).order_by(ScheduleSlot.id):
+        key = (slot.day, slot.slot_number)
+        if key in existing:
+            to_delete.append(slot.id)  # Duplicate cell: keep the oldest
+        else:
+            existing[key] = slot
+
+    inserts, updates = [], []
+    for slot in slots:
+        values = {
+            "day": WeekDay(slot.day.value),
+            "slot_number": slot.slot_number,
+            "start_time": slot.start_time,
+            "end_time": slot.end_time,
+            "slot_type": SlotType(slot.slot_type.value),
+            "class_id": slot.class_id,
+        }
+        current = existing.pop((values["day"], slot.slot_number), None)
+        if current is None:
+            inserts.append(dict(values, schedule_id=schedule.id))
+        elif any(getattr(current, field) != value for field, value in values.items()):
+            updates.append(dict(values, id=current.id))
+    to_delete.extend(slot.id for slot in existing.values())
+
+    if to_delete:
+        db.execute(delete(ScheduleSlot).where(ScheduleSlot.id.in_(to_delete)).execution_options(synchronize_session=False))
+    if updates:
+        db.execute(update(ScheduleSlot), updates)
+    inserted_ids = []
+    if inserts:
+        inserted_ids = db.scalars(insert(ScheduleSlot).returning(ScheduleSlot.id), inserts).all()
+
+    record_bulk_changes(db, SyncEntity.SCHEDULE_SLOT, schedule.user_id, to_delete, deleted=True)
+    record_bulk_changes(db, SyncEntity.SCHEDULE_SLOT, schedule.user_id, [row["id"] for row in updates] + inserted_ids)
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(to_delete)}
@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Tuple
+import threading
+
+from ..cache import TTLCache
+from ..config import settings
+from ..models.schedule import Schedule, ScheduleSlot, WeekDay
+from .academic_year import get_user_current_year
+
+DAYS = list(WeekDay)
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+def week_minute(weekday: int, hour: int, minute: int) -> int:
+    """Minutes since Monday 00:00"""
+    return weekday * MINUTES_PER_DAY + hour * 60 + minute
+
+class SlotIndex:
+    """Slots of one schedule sorted by start time within the week, for bisect lookups.
+
+    Entries are (start, end, slot_id, slot) with start/end in week minutes.
+    Kept up to date in place by upsert/remove when single slots change.
+    """
+
+    def __init__(self, schedule_id: Optional[int], slots: List[ScheduleSlot] = ()):
+        self.schedule_id = schedule_id
+        self._entries: List[Tuple[int, int, int, dict]] = sorted(self._entry(slot) for slot in slots)
+        self._starts = [entry[0] for entry in self._entries]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(slot: ScheduleSlot) -> Tuple[int, int, int, dict]:
+        day = DAYS.index(WeekDay(getattr(slot.day, "value", slot.day)))
+        start = week_minute(day, slot.start_time.hour, slot.start_time.minute)
+        end = week_minute(day, slot.end_time.hour, slot.end_time.minute)
+        info = {
+            "slot_id": slot.id,
+            "day": DAYS[day].value,
+            "slot_number": slot.slot_number,
+            "start_time": slot.start_time,
+            "end_time": slot.end_time,
+            "slot_type": getattr(slot.slot_type, "value", slot.slot_type),
+            "class_id": slot.class_id,
+        }
+        return (start, end, slot.id, info)
+
+    def upsert(self, slot: ScheduleSlot) -> None:
+        with self._lock:
+            self._remove(slot.id)
+            entry = self._entry(slot)
+            i = bisect_left(self._entries, entry)
+            self._entries.insert(i, entry)
+            self._starts.insert(i, entry[0])
+
+    def remove(self, slot_id: int) -> None:
+        with self._lock:
+            self._remove(slot_id)
+
+    def _remove(self, slot_id: int) -> None:
+        for i, entry in enumerate(self._entries):
+            if entry[2] == slot_id:
+                del self._entries[i]
+                del self._starts[i]
+                return
+
+    def lookup(self, minute: int) -> Tuple[Optional[dict], Optional[dict], Optional[int]]:
+        """(current slot, next slot, minutes until the next one starts) at a week minute"""
+        with self._lock:
+            if not self._entries:
+                return None, None, None
+            i = bisect_right(self._starts, minute)
+            current = None
+            # Slots don't overlap, so only the latest one started can still be running
+            if i > 0 and self._entries[i - 1][1] > minute:
+                current = self._entries[i - 1][3]
+            # After the last slot of the week, wrap around to Monday
+            following = self._entries[i] if i < len(self._entries) else self._entries[0]
+            starts_in = (following[0] - minute) % MINUTES_PER_WEEK
+            return current, following[3], starts_in
+
+# user_id -> SlotIndex of the user's active schedule. Single slot edits
+# patch the index in place; anything touching whole schedules drops it.
+# Other workers catch up within the TTL.
+schedule_index_cache = TTLCache(
+    "schedule_index", settings.schedule_index_max_entries, settings.schedule_index_ttl_seconds
+)
+
+def active_schedule(db: Session, user_id: int) -> Optional[Schedule]:
+    """The user's active schedule, preferring the one for their current academic year"""
+    current_year = get_user_current_year(user_id, db)
+    return db.query(Schedule).filter(
+        Schedule.user_id == user_id,
+        Schedule.is_active == True
+    ).order_by((Schedule.year == current_year).desc(), Schedule.id.desc()).first()
+
+def get_slot_index(db: Session, user_id: int) -> SlotIndex:
+    index = schedule_index_cache.get(user_id)
+    if index is None:
+        schedule = active_schedule(db, user_id)
+        slots = db.query(ScheduleSlot).filter(ScheduleSlot.schedule_id == schedule.id).all() if schedule else []
+        index = SlotIndex(schedule.id if schedule else None, slots)
+        schedule_index_cache.set(user_id, index)
+    return index
+
+def slot_changed(user_id: int, slot: ScheduleSlot) -> None:
+    """Call after a slot was created or updated"""
+    index = schedule_index_cache.get(user_id)
+    if index is not None and index.schedule_id == slot.schedule_id:
+        index.upsert(slot)
+
+def slot_deleted(user_id: int, schedule_id: int, slot_id: int) -> None:
+    index = schedule_index_cache.get(user_id)
+    if index is not None and index.schedule_id == schedule_id:
+        index.remove(slot_id)
+
+def invalidate_schedule_index(user_id: Optional[int] = None) -> None:
+    """Drop one user's index (None: everyone's) after a schedule-wide change"""
+    if user_id is None:
+        schedule_index_cache.clear()
+    else:
+        schedule_index_cache.pop(user_id)
+
+def local_week_minute(now: datetime) -> int:
+    return week_minute(now.weekday(), now.hour, now.minute)
@@ -0,0 +1,91 @@
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+import threading
+
+from ..models.schedule import Schedule, ScheduleSlot
+
+def _day(slot) -> str:
+    # Accept both the ORM enum and the API (str) enum
+    return getattr(slot.day, "value", slot.day)
+
+def find_conflicts(slots: Iterable) -> List[dict]:
+    """Invalid, duplicate and overlapping slots among `slots`.
+
+    Anything with day, slot_number, start_time and end_time works (ORM
+    slots or API payloads). Each day is sorted by start time and swept once
+    while tracking the slot that reaches furthest, so this is O(n log n);
+    every slot that overlaps another is reported at least once.
+    Returns dicts with kind, day and the conflicting `slots`.
+    """
+    conflicts = []
+    by_day = defaultdict(list)
+    for slot in slots:
+        if slot.start_time >= slot.end_time:
+            conflicts.append({"kind": "invalid_time", "day": _day(slot), "slots": [slot]})
+        else:
+            by_day[_day(slot)].append(slot)
+
+    for day, day_slots in by_day.items():
+        cells = {}
+        for slot in day_slots:
+            if slot.slot_number in cells:
+                conflicts.append({"kind": "duplicate", "day": day, "slots": [cells[slot.slot_number], slot]})
+            else:
+                cells[slot.slot_number] = slot
+
+        furthest = None
+        for slot in sorted(day_slots, key=lambda slot: (slot.start_time, slot.end_time)):
+            if furthest is not None and slot.start_time < furthest.end_time:
+                conflicts.append({"kind": "overlap", "day": day, "slots": [furthest, slot]})
+            if furthest is None or slot.end_time > furthest.end_time:
+                furthest = slot
+    return conflicts
+
+def conflicts_with(db: Session, schedule_id: int, candidate, exclude_slot_id: Optional[int] = None) -> List[dict]:
+    """Conflicts between `candidate` and the stored slots of its day"""
+    existing = db.query(ScheduleSlot).filter(
+        ScheduleSlot.schedule_id == schedule_id,
+        ScheduleSlot.day == _day(candidate),
+    )
+    if exclude_slot_id is not None:
+        existing = existing.filter(ScheduleSlot.id != exclude_slot_id)
+    return [
+        conflict for conflict in find_conflicts(list(existing) + [candidate])
+        if any(slot is candidate for slot in conflict["slots"])
+    ]
+
+def describe_conflicts(conflicts: List[dict]) -> List[dict]:
+    """API form of find_conflicts() results (see schemas.SlotConflict)"""
+    messages = {
+        "invalid_time": "Slot {0} ends before it starts",
+        "duplicate": "Slot number {0} is used twice",
+        "overlap": "Slots {0} and {1} overlap",
+    }
+    described = []
+    for conflict in conflicts:
+        numbers = [slot.slot_number for slot in conflict["slots"]]
+        described.append({
+            "kind": conflict["kind"],
+            "day": conflict["day"],
+            "slot_numbers": numbers,
+            "message": f"{conflict['day'].capitalize()}: " + messages[conflict["kind"]].format(*numbers),
+        })
+    return described
+
+# Fixed pool of lock stripes: schedules sharing a stripe only serialize
+# each other's (short) slot writes, and memory stays bounded
+_SCHEDULE_LOCK_STRIPES = 64
+_schedule_locks = [threading.Lock() for _ in range(_SCHEDULE_LOCK_STRIPES)]
+
+@contextmanager
+def locked_schedule(db: Session, schedule_id: int) -> Iterator[Optional[Schedule]]:
+    """Load a schedule for a validated slot write; hold this until after commit.
+
+    The row lock (SELECT ... FOR UPDATE) serializes writers across workers
+    on Postgres; the in-process lock does the same for SQLite, which
+    ignores FOR UPDATE. Yields None if the schedule doesn't exist.
+    """
+    with _schedule_locks[schedule_id % _SCHEDULE_LOCK_STRIPES]:
+        yield db.query(Schedule).filter(Schedule.id == schedule_id).with_for_update().first()
@@ -0,0 +1,93 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, event, func, literal, true, or_, and_
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from ..models.homework import Homework
+from ..models.classes import Class
+from ..models.notes import Note
+from ..models.schedule import Schedule, ScheduleSlot
+from ..models.sync_change import SyncChange, SyncEntity
+
+# Models whose changes are logged for delta sync
+SYNCED = {
+    Homework: SyncEntity.HOMEWORK,
+    Class: SyncEntity.CLASS,
+    Note: SyncEntity.NOTE,
+    ScheduleSlot: SyncEntity.SCHEDULE_SLOT,
+    Schedule: SyncEntity.SCHEDULE,
+}
+
+# (entity, id) -> (user_id, deleted)
+Changes = Dict[Tuple[SyncEntity, int], Tuple[int, bool]]
+
+def record_changes(connection, changes: Changes) -> None:
+    """Log changes in the current transaction, replacing each record's previous row.
+
+    On Postgres a transaction-scoped advisory lock per user makes a user's
+    writers commit in seq order, so a client that has seen seq N can never
+    miss a change with a smaller seq committed later. SQLite has a single
+    writer anyway.
+    """
+    if not changes:
+        return
+
+    if connection.dialect.name == "postgresql":
+        for user_id in sorted({user_id for user_id, _ in changes.values()}):
+            connection.execute(select(func.pg_advisory_xact_lock(user_id)))
+
+    by_entity = {}
+    for entity, entity_id in changes:
+        by_entity.setdefault(entity, []).append(entity_id)
+    connection.execute(delete(SyncChange).where(or_(*(
+        and_(SyncChange.entity == entity, SyncChange.entity_id.in_(ids)) for entity, ids in by_entity.items()
+    ))))
+
+    now = datetime.utcnow()
+    connection.execute(insert(SyncChange), [
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "deleted": deleted, "changed_at": now}
+        for (entity, entity_id), (user_id, deleted) in sorted(changes.items(), key=lambda item: item[0][1])
+    ])
+
+def record_bulk_changes(db: Session, entity: SyncEntity, user_id: int, ids: Iterable[int], deleted: bool = False) -> None:
+    """Log writes made with bulk statements, which the flush listener can't see"""
+    record_changes(db.connection(), {(entity, entity_id): (user_id, deleted) for entity_id in ids})
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session, flush_context):
+    """Log every ORM insert, update and delete of a synced model in the same transaction"""
+    objects = [(obj, False) for obj in session.new]
+    objects += [(obj, False) for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    objects += [(obj, True) for obj in session.deleted]
+    objects = [(obj, deleted) for obj, deleted in objects if type(obj) in SYNCED and obj.id is not None]
+    if not objects:
+        return
+
+    # Slots belong to users through their schedule
+    connection = session.connection()
+    schedule_ids = {obj.schedule_id for obj, _ in objects if isinstance(obj, ScheduleSlot)}
+    schedule_users = dict(connection.execute(
+        select(Schedule.id, Schedule.user_id).where(Schedule.id.in_(schedule_ids))
+    ).all()) if schedule_ids else {}
+
+    changes = {}
+    for obj, deleted in objects:
+        user_id = schedule_users.get(obj.schedule_id) if isinstance(obj, ScheduleSlot) else obj.user_id
+        if user_id is not None:
+            changes[(SYNCED[type(obj)], obj.id)] = (user_id, deleted)
+    record_changes(connection, changes)
+
+def record_all_deleted(db: Session, entities: Iterable[SyncEntity]) -> None:
+    """Tombstone every record of `entities` (for wiping whole tables), before the rows go"""
+    entities = set(entities)
+    db.execute(delete(SyncChange).where(SyncChange.entity.in_(entities)))
+    now = datetime.utcnow()
+    columns = ["user_id", "entity", "entity_id", "deleted", "changed_at"]
+    for model, entity in SYNCED.items():
+        if entity not in entities:
+            continue
+        user_id = Schedule.user_id if model is ScheduleSlot else model.user_id
+        rows = select(user_id, literal(entity, SyncChange.entity.type), model.id, true(), literal(now))
+        if model is ScheduleSlot:
+            rows = rows.join(Schedule, Schedule.id == ScheduleSlot.schedule_id)
+        db.execute(insert(SyncChange).from_select(columns, rows.order_by(model.id)))
@@ -0,0 +1,65 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, update
+import logging
+
+from ..models.homework import Homework, Status
+from ..models.user_stats import UserStats
+
+logger = logging.getLogger(__name__)
+
+def ensure_user_stats(db: Session, user_id: int) -> UserStats:
+    """Get the counters row for a user, backfilling it from the homework table if missing"""
+    # Pending (unflushed) changes are deliberately ignored here: callers
+    # apply their own delta on top of the persisted state.
+    with db.no_autoflush:
+        stats = db.get(UserStats, user_id)
+        if stats:
+            return stats
+
+        # Existing users were backfilled by migration 0015, so this normally
+        # runs on a user's first homework write and counts nothing
+        total, completed = db.query(
+            func.count(Homework.id),
+            func.coalesce(func.sum(case((Homework.status == Status.COMPLETED, 1), else_=0)), 0)
+        ).filter(Homework.user_id == user_id).one()
+
+    stats = UserStats(
+        user_id=user_id,
+        total_homework=total,
+        pending_homework=total - completed,
+        completed_homework=completed
+    )
+    db.add(stats)
+    logger.info(f"Backfilled homework counters for user {user_id}: {total} total, {completed} completed")
+    return stats
+
+def apply_homework_delta(db: Session, user_id: int, pending: int = 0, completed: int = 0) -> None:
+    """Adjust a user's homework counters in the current transaction"""
+    if not pending and not completed:
+        return
+
+    ensure_user_stats(db, user_id)
+    db.flush()
+
+    # Relative UPDATE so concurrent writers never overwrite each other's increments
+    db.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            total_homework=UserStats.total_homework + pending + completed,
+            pending_homework=UserStats.pending_homework + pending,
+            completed_homework=UserStats.completed_homework + completed
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+def status_delta(old_status, new_status) -> dict:
+    """Counter delta for a homework item moving from old_status to new_status (None = not present)"""
+    delta = {"pending": 0, "completed": 0}
+    for value, sign in ((old_status, -1), (new_status, 1)):
+        if value is None:
+            continue
+        # Accept both the ORM enum and the API (str) enum
+        key = "completed" if getattr(value, "value", value) == Status.COMPLETED.value else "pending"
+        delta[key] += sign
+    return delta
@@ -0,0 +1,36 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+import logging
+import pytz
+
+logger = logging.getLogger(__name__)
+
+def get_timezone(name: Optional[str]):
+    """pytz timezone for an IANA name, falling back to UTC"""
+    try:
+        return pytz.timezone(name or "UTC")
+    except pytz.exceptions.UnknownTimeZoneError:
+        logger.warning(f"Unknown timezone {name}, falling back to UTC")
+        return pytz.UTC
+
+def local_now(timezone_name: Optional[str], at: Optional[datetime] = None) -> datetime:
+    """`at` (default: now) in the given timezone; a naive `at` is taken as local time"""
+    tz = get_timezone(timezone_name)
+    if at is None:
+        return datetime.now(tz)
+    if at.tzinfo is None:
+        return tz.localize(at)
+    return at.astimezone(tz)
+
+def utc_minute() -> datetime:
+    """Current naive UTC time, truncated to the minute"""
+    return datetime.utcnow().replace(second=0, microsecond=0)
+
+def to_utc(day: date, at: time, timezone_name: Optional[str]) -> datetime:
+    """Naive UTC datetime of a local wall-clock date and time (how timestamps are stored)"""
+    local = get_timezone(timezone_name).localize(datetime.combine(day, at))
+    return local.astimezone(pytz.UTC).replace(tzinfo=None)
+
+def local_day_bounds(timezone_name: Optional[str], day: date, days: int = 1) -> Tuple[datetime, datetime]:
+    """Naive UTC [start, end) of `days` local days starting at `day`"""
+    return to_utc(day, time.min, timezone_name), to_utc(day + timedelta(days=days), time.min, timezone_name)
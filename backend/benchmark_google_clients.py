@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-call overhead of Google API clients.
+
+Compares the old pattern (googleapiclient.discovery.build() for every
+request) with the pooled clients from app/services/google_clients.py:
+
+  1. client setup only (build vs. pool acquire/release)
+  2. setup + one events.get call against fake_calendar_server.py, started
+     in-process, so connection reuse is measured too
+
+Usage:
+    python benchmark_google_clients.py [--iterations 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+PORT = 8095
+os.environ["GOOGLE_CALENDAR_API_ENDPOINT"] = f"http://localhost:{PORT}/calendar/v3/"
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+import fake_calendar_server
+from app.services.google_clients import google_clients
+
+class BenchmarkUser:
+    id = 1
+    google_access_token = "benchmark-token"
+    google_refresh_token = None
+
+def old_build():
+    credentials = Credentials(token=BenchmarkUser.google_access_token)
+    return build(
+        "calendar", "v3", credentials=credentials,
+        client_options={"api_endpoint": os.environ["GOOGLE_CALENDAR_API_ENDPOINT"]}
+    )
+
+def time_calls(fn, iterations):
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(label, samples):
+    ms = lambda seconds: f"{seconds * 1000:8.3f} ms"
+    print(f"{label:<34} p50 {ms(statistics.median(samples))}   mean {ms(statistics.mean(samples))}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("localhost", PORT), fake_calendar_server.FakeCalendarHandler)
+    server.daemon_threads = True
+    fake_calendar_server.FakeCalendarHandler.log_message = lambda *a: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    user = BenchmarkUser()
+    event_id = old_build().events().insert(calendarId="primary", body={"summary": "benchmark"}).execute()["id"]
+
+    def pooled_setup():
+        client = google_clients.acquire("calendar", "v3", user)
+        google_clients.release("calendar", "v3", user, client)
+
+    def old_call():
+        old_build().events().get(calendarId="primary", eventId=event_id).execute()
+
+    def pooled_call():
+        client = google_clients.acquire("calendar", "v3", user)
+        try:
+            client.events().get(calendarId="primary", eventId=event_id).execute()
+        finally:
+            google_clients.release("calendar", "v3", user, client)
+
+    print("🧪 Google API client overhead")
+    print("=" * 40)
+    setup_old = time_calls(old_build, args.iterations)
+    setup_pooled = time_calls(pooled_setup, args.iterations)
+    call_old = time_calls(old_call, args.iterations)
+    call_pooled = time_calls(pooled_call, args.iterations)
+    server.shutdown()
+
+    report("build() per request", setup_old)
+    report("pooled acquire/release", setup_pooled)
+    report("build() + events.get", call_old)
+    report("pooled client + events.get", call_pooled)
+    print(f"Speed-up per call: {statistics.median(call_old) / statistics.median(call_pooled):.1f}x")
+    print(f"Pool: {google_clients.stats()}")
+
+if __name__ == "__main__":
+    sys.exit(main())
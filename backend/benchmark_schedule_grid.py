@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full vs. compact schedule payloads.
+
+Seeds a temporary SQLite database with a dense week (5 days x 8 slots,
+8 distinct classes) and compares GET /api/schedules/{id}, which nests the
+class and user in every slot, with GET /api/schedules/{id}/grid:
+response size and time per request.
+
+Usage:
+    python benchmark_schedule_grid.py [--iterations 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import time as clock
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/schedule_grid.db"
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.database import SessionLocal
+from app.models.user import User
+from app.models.classes import Class, ClassType
+from app.models.schedule import Schedule, ScheduleSlot, WeekDay
+
+SLOTS_PER_DAY = 8
+
+def seed_schedule() -> int:
+    db = SessionLocal()
+    try:
+        user = User(email="grid@example.com", full_name="Grid Benchmark", supabase_user_id="grid_benchmark")
+        db.add(user)
+        db.flush()
+        schedule = Schedule(user_id=user.id, name="Benchmark", year="2024-2025", is_active=True)
+        classes = [
+            Class(user_id=user.id, name=f"Class {i}", teacher=f"Teacher {i}", year="2024-2025", class_type=ClassType.OTHER)
+            for i in range(SLOTS_PER_DAY)
+        ]
+        db.add_all([schedule] + classes)
+        db.flush()
+        for d, day in enumerate(WeekDay):
+            for n in range(SLOTS_PER_DAY):
+                db.add(ScheduleSlot(schedule_id=schedule.id, class_id=classes[(d + n) % len(classes)].id, day=day,
+                                    slot_number=n + 1, start_time=clock(8 + n), end_time=clock(8 + n, 55)))
+        db.commit()
+        return schedule.id
+    finally:
+        db.close()
+
+def measure(client: TestClient, url: str, iterations: int):
+    client.get(url)  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - start)
+    assert response.status_code == 200, f"{url}: {response.status_code}"
+    return len(response.content), statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    schedule_id = seed_schedule()
+
+    print("🧪 Schedule payloads (5 x 8 grid)")
+    print("=" * 40)
+    results = {}
+    for label, url in (
+        ("ScheduleWithSlots", f"/api/schedules/{schedule_id}"),
+        ("ScheduleWithSlots (slim)", f"/api/schedules/{schedule_id}?slim=true"),
+        ("ScheduleGrid", f"/api/schedules/{schedule_id}/grid"),
+    ):
+        size, p50 = measure(client, url, args.iterations)
+        results[label] = (size, p50)
+        print(f"{label:<26} {size:>7} bytes   p50 {p50 * 1000:7.3f} ms")
+
+    full, grid = results["ScheduleWithSlots"], results["ScheduleGrid"]
+    print(f"Payload: {full[0] / grid[0]:.1f}x smaller, request: {full[1] / grid[1]:.1f}x faster")
+
+if __name__ == "__main__":
+    sys.exit(main())
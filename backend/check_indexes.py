@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN-based check that the hot router queries are served by an index.
+
+Builds each query the same way the routers do, captures the SQL the driver
+actually receives and runs it through EXPLAIN (EXPLAIN QUERY PLAN on
+SQLite). Fails if any query falls back to a full table scan.
+
+Usage:
+    python check_indexes.py                   # temporary SQLite database
+    DATABASE_URL=postgresql://... python check_indexes.py
+
+The target database is migrated to head first, so point DATABASE_URL at a
+scratch database.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/check_indexes.db"
+
+from sqlalchemy import and_, desc, event, func
+
+from app.models.database import SessionLocal, engine, run_migrations
+from app.models.homework import Homework, Status
+from app.models.classes import Class, ClassType
+from app.models.notes import Note
+from app.models.schedule import Schedule, ScheduleSlot, WeekDay
+from app.models.sync_change import SyncChange, SyncEntity
+from app.services.note_search import apply_search
+
+USER_ID = 1
+NOW = datetime.utcnow()
+
+# "status <> 'COMPLETED'" cannot seek on status, so a (user_id, due_at) index
+# is the best SQLite can do; on Postgres the planner should pick the partial index.
+OPEN_HOMEWORK_DUE_AT = ("ix_homework_open_user_due_at", "ix_homework_user_due_at")
+
+# (description, accepted index name(s), query builder)
+QUERIES = [
+    ("homework list by status", "ix_homework_user_status_due",
+     lambda db: db.query(Homework).filter(Homework.user_id == USER_ID, Homework.status == Status.PENDING)),
+    ("homework due today", OPEN_HOMEWORK_DUE_AT,
+     lambda db: db.query(Homework).filter(and_(
+         Homework.user_id == USER_ID, Homework.due_at >= NOW, Homework.due_at < NOW,
+         Homework.status != Status.COMPLETED)).order_by(Homework.due_at)),
+    ("homework overdue", OPEN_HOMEWORK_DUE_AT,
+     lambda db: db.query(Homework).filter(and_(
+         Homework.user_id == USER_ID, Homework.due_at < NOW, Homework.status != Status.COMPLETED))
+     .order_by(Homework.due_at)),
+    ("homework for class", "ix_homework_user_class",
+     lambda db: db.query(Homework).filter(and_(Homework.class_id == 1, Homework.user_id == USER_ID))),
+    ("classes for user", "ix_classes_user_id",
+     lambda db: db.query(Class).filter(Class.user_id == USER_ID)),
+    ("user notes", "ix_notes_user_updated",
+     lambda db: db.query(Note).filter(Note.user_id == USER_ID).order_by(desc(Note.updated_at))),
+    ("public notes by class type", "ix_notes_public_type_updated",
+     lambda db: db.query(Note).filter(Note.is_public == True, Note.class_type == ClassType.MATHS)
+     .order_by(desc(Note.updated_at))),
+    ("active schedule for year", "ix_schedules_year_active",
+     lambda db: db.query(Schedule).filter(Schedule.year == "2024-2025", Schedule.is_active == True)),
+    ("homework sorted by due date", "ix_homework_user_due",
+     lambda db: db.query(Homework).filter(Homework.user_id == USER_ID)
+     .order_by(Homework.due_date, Homework.due_time, Homework.id)),
+    ("public notes feed", "ix_notes_public_updated",
+     lambda db: db.query(Note).filter(Note.is_public == True).order_by(desc(Note.updated_at), desc(Note.id))),
+    ("schedule slots", "ix_schedule_slots_schedule_day_slot",
+     lambda db: db.query(ScheduleSlot).filter(ScheduleSlot.schedule_id == 1, ScheduleSlot.day == WeekDay.MONDAY)),
+    ("sync changes", "ix_sync_changes_user_seq",
+     lambda db: db.query(SyncChange).filter(SyncChange.user_id == USER_ID, SyncChange.seq > 0)
+     .order_by(SyncChange.seq)),
+    ("collection version (ETag)", "ix_sync_changes_user_entity_seq",
+     lambda db: db.query(func.max(SyncChange.seq)).filter(
+         SyncChange.user_id == USER_ID, SyncChange.entity == SyncEntity.HOMEWORK)),
+    # The FTS5 table on SQLite, the GIN expression index on Postgres
+    ("public notes search", ("notes_fts", "ix_notes_search"),
+     lambda db: apply_search(db.query(Note).filter(Note.is_public == True), ["algebra"], engine.dialect.name)),
+]
+
+def capture_sql(db, build_query):
+    """Run the query and return the (statement, parameters) sent to the driver"""
+    captured = {}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.setdefault("sql", (statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        build_query(db).all()
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+    return captured["sql"]
+
+def explain(db, statement, parameters):
+    """Return the plan for a raw statement as a list of strings"""
+    cursor = db.connection().connection.cursor()
+    if engine.dialect.name == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in cursor.fetchall()]
+
+    # Tables are tiny in a scratch database; make the planner show what it would pick at scale
+    cursor.execute("SET enable_seqscan = off")
+    cursor.execute("EXPLAIN " + statement, parameters)
+    return [row[0] for row in cursor.fetchall()]
+
+def check_indexes():
+    print(f"🔎 Checking query plans on {engine.dialect.name}")
+    print("=" * 40)
+
+    run_migrations()
+    db = SessionLocal()
+    failures = 0
+    try:
+        for description, index_names, build_query in QUERIES:
+            if isinstance(index_names, str):
+                index_names = (index_names,)
+            plan = explain(db, *capture_sql(db, build_query))
+            used = next((name for name in index_names if any(name in line for line in plan)), None)
+            if used:
+                print(f"✅ {description}: {used}")
+            else:
+                failures += 1
+                print(f"❌ {description}: expected {' or '.join(index_names)}")
+                for line in plan:
+                    print(f"     {line}")
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} not using the expected index")
+        sys.exit(1)
+    print("\n🎉 All router queries use an index")
+
+if __name__ == "__main__":
+    check_indexes()
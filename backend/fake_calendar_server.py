@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Fake Google Calendar API for local testing of the calendar outbox worker.
+
+Implements the events insert/get/update/patch/delete endpoints and the
+batch endpoint used by GoogleCalendarService, keeping events in memory. Use --fail-rate and
+--latency to exercise retries and backoff.
+
+Usage:
+    python fake_calendar_server.py [--port 8090] [--fail-rate 0.2] [--latency 0.5]
+
+Then start the backend with:
+    GOOGLE_CALENDAR_API_ENDPOINT=http://localhost:8090/calendar/v3/ python run.py
+
+GET /_events lists the stored events.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EVENTS_PATH = re.compile(r"^(?:/calendar/v3)?/calendars/(?P<calendar>[^/]+)/events(?:/(?P<event_id>[^/?]+))?")
+
+BATCH_PATH = "/batch/calendar/v3"
+
+events = {}
+events_lock = threading.Lock()
+options = argparse.Namespace(fail_rate=0.0, latency=0.0)
+
+def error_body(status, message):
+    return {"error": {"code": status, "message": message}}
+
+def handle_call(method, path, body):
+    """Apply one Calendar API call; returns (status, json body or None)"""
+    match = EVENTS_PATH.match(path)
+    if not match:
+        return 404, error_body(404, "Not found")
+    if random.random() < options.fail_rate:
+        return 503, error_body(503, "Simulated backend error")
+
+    event_id = match.group("event_id")
+    with events_lock:
+        if method == "POST" and not event_id:
+            event = json.loads(body or b"{}")
+            event["id"] = uuid.uuid4().hex
+            events[event["id"]] = event
+            return 200, event
+        if event_id not in events:
+            return 404, error_body(404, "Not Found")
+        if method == "GET":
+            return 200, events[event_id]
+        if method in ("PUT", "PATCH"):
+            event = json.loads(body or b"{}")
+            if method == "PATCH":
+                event = {**events[event_id], **event}
+            event["id"] = event_id
+            events[event_id] = event
+            return 200, event
+        if method == "DELETE":
+            del events[event_id]
+            return 204, None
+    return 405, error_body(405, "Method not allowed")
+
+def handle_batch(content_type, body):
+    """Split a multipart/mixed batch into calls and build the multipart response"""
+    message = BytesParser().parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+    boundary = "batch_" + uuid.uuid4().hex
+    parts = []
+    for part in message.get_payload():
+        request = part.get_payload(decode=False)
+        head, _, call_body = request.replace("\r\n", "\n").partition("\n\n")
+        method, path, _ = head.split("\n", 1)[0].split(" ", 2)
+        status, result = handle_call(method, path, call_body.encode())
+        payload = json.dumps(result) if result is not None else ""
+        parts.append(
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <response-{part['Content-ID'][1:]}\r\n\r\n"
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+            f"{payload}\r\n"
+        )
+    return f"multipart/mixed; boundary={boundary}", ("".join(parts) + f"--{boundary}--\r\n").encode()
+
+class FakeCalendarHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are written separately
+
+    def _send(self, status, payload=b"", content_type="application/json"):
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self, method):
+        if method == "GET" and self.path == "/_events":
+            with events_lock:
+                return self._send(200, json.dumps({"items": list(events.values())}).encode())
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if options.latency:
+            time.sleep(options.latency)
+
+        if method == "POST" and self.path.startswith(BATCH_PATH):
+            content_type, payload = handle_batch(self.headers["Content-Type"], body)
+            return self._send(200, payload, content_type)
+
+        status, result = handle_call(method, self.path, body)
+        self._send(status, json.dumps(result).encode() if result is not None else b"")
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    def log_message(self, format, *args):
+        print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of API calls answered with 503")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep before answering")
+    args = parser.parse_args()
+    options.fail_rate = args.fail_rate
+    options.latency = args.latency
+
+    server = ThreadingHTTPServer(("localhost", args.port), FakeCalendarHandler)
+    print(f"📅 Fake Google Calendar API on http://localhost:{args.port}/ (fail rate {args.fail_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
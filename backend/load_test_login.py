@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Load test: event-loop lag under concurrent logins.
+
+Fires concurrent POST /api/auth/login requests while a probe hits /health
+every few milliseconds. /health does no work, so its latency is a direct
+measure of how long the server's event loop is stalled by other requests.
+
+Usage:
+    python load_test_login.py [--concurrency 50] [--requests 500]
+
+Requirements:
+    - Backend server running on http://localhost:8000
+    - httpx (already in requirements.txt)
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+BASE_URL = "http://localhost:8000"
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def login_worker(client, queue, latencies, errors):
+    while True:
+        try:
+            i = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/auth/login",
+            json={"email": f"loadtest-{i % 100}@example.com", "full_name": f"Load Test {i}"}
+        )
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+async def probe_event_loop(client, stop, lags, interval=0.005):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        lags.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+async def run(concurrency: int, total: int):
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    login_latencies, errors, lags = [], [], []
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30, limits=limits) as client, \
+               httpx.AsyncClient(base_url=BASE_URL, timeout=30) as probe_client:
+        # Baseline probe latency with the server idle
+        idle = []
+        for _ in range(20):
+            start = time.perf_counter()
+            await probe_client.get("/health")
+            idle.append(time.perf_counter() - start)
+
+        probe = asyncio.create_task(probe_event_loop(probe_client, stop, lags))
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker(client, queue, login_latencies, errors) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    return idle, login_latencies, lags, errors, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    print("🧪 Event-loop lag under concurrent logins")
+    print("=" * 40)
+
+    try:
+        idle, logins, lags, errors, elapsed = asyncio.run(run(args.concurrency, args.requests))
+    except httpx.ConnectError:
+        print("❌ Cannot connect to backend server")
+        print("Start it with: cd backend && python run.py")
+        sys.exit(1)
+
+    ms = lambda seconds: f"{seconds * 1000:.1f} ms"
+    print(f"Logins:      {len(logins)} in {elapsed:.2f}s ({len(logins) / elapsed:.0f} req/s), {len(errors)} errors")
+    print(f"Login p50:   {ms(statistics.median(logins))}   p99: {ms(percentile(logins, 99))}")
+    print(f"Idle probe:  p50 {ms(statistics.median(idle))}")
+    print(f"Loop lag:    p50 {ms(statistics.median(lags))}   p99 {ms(percentile(lags, 99))}   max {ms(max(lags))}")
+
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Initial schema
+
+Tables as they were created by Base.metadata.create_all before Alembic was
+introduced (including the users.timezone column from
+001_add_user_timezone.sql). Existing databases are stamped at this revision
+by run_migrations() instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-04-02 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CLASS_TYPES = (
+    'MATHS', 'ENGLISH', 'SCIENCE', 'HISTORY', 'GEOGRAPHY', 'ART', 'MUSIC',
+    'PHYSICAL_EDUCATION', 'COMPUTER_SCIENCE', 'FOREIGN_LANGUAGE', 'LITERATURE',
+    'CHEMISTRY', 'PHYSICS', 'BIOLOGY', 'OTHER',
+)
+EDUCATION_LEVELS = tuple(f'GRADE_{i}' for i in range(1, 13))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('full_name', sa.String(length=255), nullable=False),
+        sa.Column('avatar_url', sa.String(length=500), nullable=True),
+        sa.Column('google_access_token', sa.Text(), nullable=True),
+        sa.Column('google_refresh_token', sa.Text(), nullable=True),
+        sa.Column('google_token_expiry', sa.DateTime(), nullable=True),
+        sa.Column('timezone', sa.String(length=50), nullable=True),
+        sa.Column('supabase_user_id', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_supabase_user_id', 'users', ['supabase_user_id'], unique=True)
+
+    op.create_table(
+        'classes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('teacher', sa.String(length=100), nullable=False),
+        sa.Column('year', sa.String(length=20), nullable=False),
+        sa.Column('half_group', sa.String(length=10), nullable=True),
+        sa.Column('color', sa.String(length=7), nullable=True),
+        sa.Column('class_type', sa.Enum(*CLASS_TYPES, name='classtype'), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_classes_id', 'classes', ['id'])
+
+    op.create_table(
+        'schedules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('year', sa.String(length=20), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_schedules_id', 'schedules', ['id'])
+
+    op.create_table(
+        'schedule_slots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('schedule_id', sa.Integer(), nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=True),
+        sa.Column('day', sa.Enum('MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', name='weekday'), nullable=False),
+        sa.Column('slot_number', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=False),
+        sa.Column('end_time', sa.Time(), nullable=False),
+        sa.Column('slot_type', sa.Enum('CLASS', 'READING', 'RECESS', name='slottype'), nullable=False),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id']),
+        sa.ForeignKeyConstraint(['schedule_id'], ['schedules.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_schedule_slots_id', 'schedule_slots', ['id'])
+
+    op.create_table(
+        'homework',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('assigned_date', sa.Date(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('due_time', sa.Time(), nullable=False),
+        sa.Column('priority', sa.Enum('LOW', 'MEDIUM', 'HIGH', name='priority'), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', name='status'), nullable=True),
+        sa.Column('google_calendar_event_id', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_homework_id', 'homework', ['id'])
+
+    op.create_table(
+        'notes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('class_type', postgresql.ENUM(*CLASS_TYPES, name='classtype', create_type=False), nullable=False),
+        sa.Column('is_public', sa.Boolean(), nullable=False),
+        sa.Column('year', sa.String(length=20), nullable=False),
+        sa.Column('school', sa.String(length=200), nullable=True),
+        sa.Column('education_level', sa.Enum(*EDUCATION_LEVELS, name='educationlevel'), nullable=True),
+        sa.Column('google_drive_file_id', sa.String(length=100), nullable=True),
+        sa.Column('google_drive_file_url', sa.String(length=500), nullable=True),
+        sa.Column('google_drive_file_name', sa.String(length=255), nullable=True),
+        sa.Column('google_drive_mime_type', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notes_id', 'notes', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_id', table_name='notes')
+    op.drop_table('notes')
+    op.drop_index('ix_homework_id', table_name='homework')
+    op.drop_table('homework')
+    op.drop_index('ix_schedule_slots_id', table_name='schedule_slots')
+    op.drop_table('schedule_slots')
+    op.drop_index('ix_schedules_id', table_name='schedules')
+    op.drop_table('schedules')
+    op.drop_index('ix_classes_id', table_name='classes')
+    op.drop_table('classes')
+    op.drop_index('ix_users_supabase_user_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
+    for enum_name in ('educationlevel', 'status', 'priority', 'slottype', 'weekday', 'classtype'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,39 @@
+"""Add per-user homework counters
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-04-02 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases stamped at 0001 may already have the table from create_all
+    if 'user_stats' in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_homework', sa.Integer(), nullable=False),
+        sa.Column('pending_homework', sa.Integer(), nullable=False),
+        sa.Column('completed_homework', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
@@ -0,0 +1,53 @@
+"""Composite and partial indexes for the router query shapes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-04-02 10:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) - mirrored in the models' __table_args__
+INDEXES = [
+    ('ix_homework_user_status_due', 'homework', ['user_id', 'status', 'due_date']),
+    ('ix_homework_user_class', 'homework', ['user_id', 'class_id']),
+    ('ix_notes_public_type_updated', 'notes', ['is_public', 'class_type', 'updated_at']),
+    ('ix_notes_user_updated', 'notes', ['user_id', 'updated_at']),
+    ('ix_classes_user_id', 'classes', ['user_id']),
+    ('ix_schedules_year_active', 'schedules', ['year', 'is_active']),
+    ('ix_schedule_slots_schedule_day_slot', 'schedule_slots', ['schedule_id', 'day', 'slot_number']),
+]
+
+# Postgres only: open homework is what every list/dashboard query filters on
+PARTIAL_INDEXES = [
+    ('ix_homework_open_user_due', 'homework', ['user_id', 'due_date']),
+    ('ix_homework_open_user_class', 'homework', ['user_id', 'class_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for name, table, columns in PARTIAL_INDEXES:
+            op.create_index(name, table, columns, postgresql_where=sa.text("status <> 'COMPLETED'"))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for name, table, _ in PARTIAL_INDEXES:
+            op.drop_index(name, table_name=table)
+
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,33 @@
+"""Indexes backing the keyset pagination sort orders
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-04-09 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_homework_user_due', 'homework', ['user_id', 'due_date', 'due_time', 'id']),
+    ('ix_homework_user_updated', 'homework', ['user_id', 'updated_at', 'id']),
+    ('ix_notes_public_updated', 'notes', ['is_public', 'updated_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
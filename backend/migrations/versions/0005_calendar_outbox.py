@@ -0,0 +1,50 @@
+"""Transactional outbox for Google Calendar side effects
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-04-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'calendar_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('homework_id', sa.Integer(), nullable=True),
+        sa.Column('operation', sa.Enum('CREATE', 'UPDATE', 'DELETE', name='outboxoperation'), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'DONE', 'FAILED', name='outboxstatus'), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_calendar_outbox_id', 'calendar_outbox', ['id'])
+    op.create_index('ix_calendar_outbox_status_user', 'calendar_outbox', ['status', 'user_id', 'id'])
+    op.create_index('ix_calendar_outbox_homework', 'calendar_outbox', ['homework_id', 'operation'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_outbox_homework', table_name='calendar_outbox')
+    op.drop_index('ix_calendar_outbox_status_user', table_name='calendar_outbox')
+    op.drop_index('ix_calendar_outbox_id', table_name='calendar_outbox')
+    op.drop_table('calendar_outbox')
+    for enum_name in ('outboxstatus', 'outboxoperation'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,38 @@
+"""Cached Google Drive file metadata
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-04-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'drive_file_cache',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('file_id', sa.String(length=100), nullable=False),
+        sa.Column('accessible', sa.Boolean(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('mime_type', sa.String(length=100), nullable=True),
+        sa.Column('web_view_link', sa.String(length=500), nullable=True),
+        sa.Column('is_public', sa.Boolean(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'file_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('drive_file_cache')
@@ -0,0 +1,35 @@
+"""Background Google Drive enrichment status on notes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-04-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+drive_status = sa.Enum('PENDING', 'READY', 'FAILED', name='drivestatus')
+
+
+def upgrade() -> None:
+    drive_status.create(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table('notes') as batch_op:
+        batch_op.add_column(sa.Column('drive_status', drive_status, nullable=True))
+
+    # Notes attached before this revision were resolved synchronously
+    op.execute("UPDATE notes SET drive_status = 'READY' WHERE google_drive_file_id IS NOT NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('notes') as batch_op:
+        batch_op.drop_column('drive_status')
+    drive_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,73 @@
+"""Full-text search index over notes
+
+SQLite: external-content FTS5 table kept in sync with notes by triggers.
+Postgres: GIN index on a weighted tsvector expression; the expression must
+stay identical to NOTE_SEARCH_VECTOR in app/services/note_search.py.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-04-22 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_COLUMNS = "title, content, school, google_drive_file_name"
+
+SQLITE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE notes_fts USING fts5(
+        {FTS_COLUMNS},
+        content='notes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.content, new.school, new.google_drive_file_name);
+    END""",
+    f"""CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.content, old.school, old.google_drive_file_name);
+    END""",
+    f"""CREATE TRIGGER notes_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.title, old.content, old.school, old.google_drive_file_name);
+        INSERT INTO notes_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.title, new.content, new.school, new.google_drive_file_name);
+    END""",
+    # Index the notes that already exist
+    "INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(google_drive_file_name, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(school, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_STATEMENTS:
+            op.execute(statement)
+    elif dialect == 'postgresql':
+        op.execute(f"CREATE INDEX ix_notes_search ON notes USING GIN (({POSTGRES_SEARCH_VECTOR}))")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('notes_fts_update', 'notes_fts_delete', 'notes_fts_insert'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS notes_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_notes_search")
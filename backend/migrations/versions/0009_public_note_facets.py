@@ -0,0 +1,44 @@
+"""Precomputed facet counts for public notes
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-04-23 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'public_note_facets',
+        sa.Column('class_type', sa.String(length=50), nullable=False),
+        sa.Column('education_level', sa.String(length=20), nullable=False),
+        sa.Column('year', sa.String(length=20), nullable=False),
+        sa.Column('school', sa.String(length=200), nullable=False),
+        sa.Column('note_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('class_type', 'education_level', 'year', 'school'),
+    )
+
+    # Backfill from the existing public notes
+    op.execute(
+        "INSERT INTO public_note_facets (class_type, education_level, year, school, note_count) "
+        "SELECT CAST(class_type AS VARCHAR(50)), COALESCE(CAST(education_level AS VARCHAR(20)), ''), "
+        "year, COALESCE(school, ''), COUNT(*) "
+        "FROM notes WHERE is_public "
+        "GROUP BY CAST(class_type AS VARCHAR(50)), COALESCE(CAST(education_level AS VARCHAR(20)), ''), "
+        "year, COALESCE(school, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('public_note_facets')
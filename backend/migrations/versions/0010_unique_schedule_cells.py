@@ -0,0 +1,35 @@
+"""One slot per (schedule, day, slot_number)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-04-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = ['schedule_id', 'day', 'slot_number']
+
+
+def upgrade() -> None:
+    # Duplicate cells were accepted before; keep the oldest slot of each
+    op.execute(
+        "DELETE FROM schedule_slots WHERE id NOT IN ("
+        "SELECT MIN(id) FROM schedule_slots GROUP BY schedule_id, day, slot_number)"
+    )
+    op.drop_index('ix_schedule_slots_schedule_day_slot', table_name='schedule_slots')
+    op.create_index('ix_schedule_slots_schedule_day_slot', 'schedule_slots', COLUMNS, unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedule_slots_schedule_day_slot', table_name='schedule_slots')
+    op.create_index('ix_schedule_slots_schedule_day_slot', 'schedule_slots', COLUMNS)
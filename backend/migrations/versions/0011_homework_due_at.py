@@ -0,0 +1,70 @@
+"""UTC due timestamp on homework
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2024-04-29 09:00:00.000000
+
+"""
+from datetime import datetime, time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import pytz
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _to_utc(due_date, due_time, timezone_name):
+    # Same as app.timezones.to_utc, frozen here so the migration doesn't change with the app
+    try:
+        tz = pytz.timezone(timezone_name or 'UTC')
+    except pytz.exceptions.UnknownTimeZoneError:
+        tz = pytz.UTC
+    local = tz.localize(datetime.combine(due_date, due_time or time(23, 59)))
+    return local.astimezone(pytz.UTC).replace(tzinfo=None)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('homework') as batch_op:
+        batch_op.add_column(sa.Column('due_at', sa.DateTime(), nullable=True))
+
+    homework = sa.table(
+        'homework',
+        sa.column('id', sa.Integer()), sa.column('user_id', sa.Integer()),
+        sa.column('due_date', sa.Date()), sa.column('due_time', sa.Time()), sa.column('due_at', sa.DateTime()),
+    )
+    users = sa.table('users', sa.column('id', sa.Integer()), sa.column('timezone', sa.String()))
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(homework.c.id, homework.c.due_date, homework.c.due_time, users.c.timezone)
+        .select_from(homework.outerjoin(users, users.c.id == homework.c.user_id))
+    ).all()
+    update = homework.update().where(homework.c.id == sa.bindparam('homework_id')).values(due_at=sa.bindparam('due_at'))
+    for start in range(0, len(rows), BATCH_SIZE):
+        bind.execute(update, [
+            {'homework_id': row.id, 'due_at': _to_utc(row.due_date, row.due_time, row.timezone)}
+            for row in rows[start:start + BATCH_SIZE]
+        ])
+
+    op.create_index('ix_homework_user_due_at', 'homework', ['user_id', 'due_at'])
+    if bind.dialect.name == 'postgresql':
+        # Every due-today / overdue / upcoming query is on open homework
+        op.create_index('ix_homework_open_user_due_at', 'homework', ['user_id', 'due_at'],
+                        postgresql_where=sa.text("status <> 'COMPLETED'"))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_homework_open_user_due_at', table_name='homework')
+    op.drop_index('ix_homework_user_due_at', table_name='homework')
+    with op.batch_alter_table('homework') as batch_op:
+        batch_op.drop_column('due_at')
@@ -0,0 +1,73 @@
+"""Change log for delta sync
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2024-05-02 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+sync_entity = sa.Enum('HOMEWORK', 'CLASS', 'NOTE', 'SCHEDULE_SLOT', name='syncentity')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_changes',
+        sa.Column('seq', sa.Integer(), nullable=False, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('entity', sync_entity, nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted', sa.Boolean(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index('ix_sync_changes_user_seq', 'sync_changes', ['user_id', 'seq'])
+    op.create_index('ix_sync_changes_entity', 'sync_changes', ['entity', 'entity_id'])
+
+    # Every existing record starts with one change, so since=0 is a full sync
+    sync_changes = sa.table(
+        'sync_changes',
+        sa.column('user_id'), sa.column('entity'), sa.column('entity_id'), sa.column('deleted'), sa.column('changed_at'),
+    )
+    sources = {
+        'HOMEWORK': sa.table('homework', sa.column('id'), sa.column('user_id'), sa.column('updated_at')),
+        'CLASS': sa.table('classes', sa.column('id'), sa.column('user_id'), sa.column('updated_at')),
+        'NOTE': sa.table('notes', sa.column('id'), sa.column('user_id'), sa.column('updated_at')),
+    }
+    for entity, table in sources.items():
+        op.execute(sync_changes.insert().from_select(
+            ['user_id', 'entity', 'entity_id', 'deleted', 'changed_at'],
+            sa.select(
+                table.c.user_id, sa.literal_column(f"'{entity}'"), table.c.id, sa.false(),
+                sa.func.coalesce(table.c.updated_at, sa.func.current_timestamp())
+            ).order_by(table.c.id)
+        ))
+
+    slots = sa.table('schedule_slots', sa.column('id'), sa.column('schedule_id'))
+    schedules = sa.table('schedules', sa.column('id'), sa.column('user_id'))
+    op.execute(sync_changes.insert().from_select(
+        ['user_id', 'entity', 'entity_id', 'deleted', 'changed_at'],
+        sa.select(
+            schedules.c.user_id, sa.literal_column("'SCHEDULE_SLOT'"), slots.c.id, sa.false(),
+            sa.func.current_timestamp()
+        ).select_from(slots.join(schedules, schedules.c.id == slots.c.schedule_id)).order_by(slots.c.id)
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_changes_entity', table_name='sync_changes')
+    op.drop_index('ix_sync_changes_user_seq', table_name='sync_changes')
+    op.drop_table('sync_changes')
+    sync_entity.drop(op.get_bind(), checkfirst=True)
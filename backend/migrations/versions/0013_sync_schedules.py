@@ -0,0 +1,43 @@
+"""Log schedule changes for delta sync
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2024-05-06 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # A new enum value can't be used in the transaction that adds it
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE syncentity ADD VALUE IF NOT EXISTS 'SCHEDULE'")
+
+    sync_changes = sa.table(
+        'sync_changes',
+        sa.column('user_id'), sa.column('entity'), sa.column('entity_id'), sa.column('deleted'), sa.column('changed_at'),
+    )
+    schedules = sa.table('schedules', sa.column('id'), sa.column('user_id'), sa.column('updated_at'))
+    op.execute(sync_changes.insert().from_select(
+        ['user_id', 'entity', 'entity_id', 'deleted', 'changed_at'],
+        sa.select(
+            schedules.c.user_id, sa.literal_column("'SCHEDULE'"), schedules.c.id, sa.false(),
+            sa.func.coalesce(schedules.c.updated_at, sa.func.current_timestamp())
+        ).order_by(schedules.c.id)
+    ))
+
+
+def downgrade() -> None:
+    # Postgres can't drop an enum value; only the rows go
+    op.execute("DELETE FROM sync_changes WHERE entity = 'SCHEDULE'")
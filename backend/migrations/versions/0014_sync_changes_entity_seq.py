@@ -0,0 +1,27 @@
+"""Per-collection change versions for ETags
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2024-05-07 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # max(seq) of one user's homework, classes, ... is a single seek
+    op.create_index('ix_sync_changes_user_entity_seq', 'sync_changes', ['user_id', 'entity', 'seq'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_changes_user_entity_seq', table_name='sync_changes')
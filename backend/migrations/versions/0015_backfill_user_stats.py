@@ -0,0 +1,47 @@
+"""Backfill homework counters for users created before 0002
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2024-05-08 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0015'
+down_revision: Union[str, None] = '0014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # From here on a missing counters row means the user has no homework, so
+    # reads never have to create one
+    users = sa.table('users', sa.column('id'))
+    homework = sa.table('homework', sa.column('user_id'), sa.column('status'))
+    user_stats = sa.table(
+        'user_stats',
+        sa.column('user_id'), sa.column('total_homework'), sa.column('pending_homework'),
+        sa.column('completed_homework'), sa.column('updated_at'),
+    )
+
+    def count(*conditions):
+        return sa.select(sa.func.count()).where(homework.c.user_id == users.c.id, *conditions).scalar_subquery()
+
+    total = count()
+    completed = count(homework.c.status == 'COMPLETED')
+    op.execute(user_stats.insert().from_select(
+        ['user_id', 'total_homework', 'pending_homework', 'completed_homework', 'updated_at'],
+        sa.select(users.c.id, total, total - completed, completed, sa.func.current_timestamp())
+        .where(~sa.exists().where(user_stats.c.user_id == users.c.id))
+        .order_by(users.c.id)
+    ))
+
+
+def downgrade() -> None:
+    # The rows are indistinguishable from ones the write handlers created
+    pass
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Check POST /api/homework/bulk against the per-user homework counters.
+
+Runs in-process against a temporary SQLite database, so no server is needed.
+
+Usage:
+    python test_homework_bulk.py
+    python -m pytest test_homework_bulk.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/homework_bulk.db"
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.auth import create_access_token
+from app.models.database import SessionLocal
+from app.models.user import User
+from app.models.user_stats import UserStats
+from app.models.classes import Class, ClassType
+from app.models.homework import Homework
+
+def seed_user(email: str) -> dict:
+    """A user with one class and one pending homework item, but no counters row yet"""
+    db = SessionLocal()
+    try:
+        user = User(email=email, full_name="Bulk", supabase_user_id=f"user_{email}")
+        db.add(user)
+        db.flush()
+        class_ = Class(user_id=user.id, name="Class", teacher="T", year="2024-2025", class_type=ClassType.OTHER)
+        db.add(class_)
+        db.flush()
+        homework = Homework(class_id=class_.id, user_id=user.id, title="Existing",
+                            due_date=date.today() + timedelta(days=1))
+        db.add(homework)
+        db.commit()
+        assert db.get(UserStats, user.id) is None
+
+        return {
+            "headers": {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"},
+            "user_id": user.id,
+            "class_id": class_.id,
+            "homework_id": homework.id,
+        }
+    finally:
+        db.close()
+
+def stored_counters(user_id: int) -> tuple:
+    db = SessionLocal()
+    try:
+        stats = db.get(UserStats, user_id)
+        return stats.total_homework, stats.pending_homework, stats.completed_homework
+    finally:
+        db.close()
+
+def test_bulk_counters_start_without_stats_row():
+    client = TestClient(app)
+    user = seed_user("bulk@example.com")
+    due_date = (date.today() + timedelta(days=3)).isoformat()
+
+    response = client.post("/api/homework/bulk", headers=user["headers"], json={"operations": [
+        {"action": "create", "homework": {"title": "New 1", "due_date": due_date, "class_id": user["class_id"]}},
+        {"action": "create", "homework": {"title": "New 2", "due_date": due_date, "class_id": user["class_id"]}},
+        {"action": "complete", "id": user["homework_id"]},
+    ]})
+    assert response.status_code == 200, response.text
+
+    counters = stored_counters(user["user_id"])
+    print(f"   counters after bulk: total, pending, completed = {counters}")
+    assert counters == (3, 2, 1), f"expected (3, 2, 1), got {counters}"
+
+def test_bulk_update_rejects_nulls():
+    client = TestClient(app)
+    user = seed_user("bulk-nulls@example.com")
+
+    for field in ("status", "due_date", "title", "priority"):
+        response = client.post("/api/homework/bulk", headers=user["headers"], json={"operations": [
+            {"action": "update", "id": user["homework_id"], "changes": {field: None}},
+        ]})
+        print(f"   null {field}: {response.status_code}")
+        assert response.status_code == 422, f"null {field}: {response.status_code} {response.text}"
+
+if __name__ == "__main__":
+    print("🧪 Checking bulk homework operations")
+    print("=" * 40)
+    try:
+        test_bulk_counters_start_without_stats_row()
+        test_bulk_update_rejects_nulls()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("\n🎉 Bulk operations keep the counters right")
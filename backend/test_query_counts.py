@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Check that list endpoints issue a fixed number of SQL statements no matter
+how many rows they return (no N+1 lazy loads during serialization).
+
+Runs in-process against a temporary SQLite database, so no server is needed.
+
+Usage:
+    python test_query_counts.py
+    python -m pytest test_query_counts.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, time, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/query_counts.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.auth import create_access_token
+from app.models.database import SessionLocal, engine
+from app.models.user import User
+from app.models.classes import Class, ClassType
+from app.models.homework import Homework
+from app.models.schedule import Schedule, ScheduleSlot, WeekDay
+
+SMALL, LARGE = 3, 30
+
+def seed_user(email: str, size: int) -> dict:
+    """Create a user with `size` classes, homework items and schedule slots"""
+    db = SessionLocal()
+    try:
+        user = User(email=email, full_name="Query Count", supabase_user_id=f"user_{email}")
+        db.add(user)
+        db.flush()
+
+        schedule = Schedule(user_id=user.id, name=email, year=email, is_active=True)
+        db.add(schedule)
+        db.flush()
+
+        days = list(WeekDay)
+        for i in range(size):
+            class_ = Class(user_id=user.id, name=f"Class {i}", teacher="T", year="2024-2025", class_type=ClassType.OTHER)
+            db.add(class_)
+            db.flush()
+            db.add(Homework(class_id=class_.id, user_id=user.id, title=f"Homework {i}",
+                            due_date=date.today() + timedelta(days=i % 5)))
+            db.add(ScheduleSlot(schedule_id=schedule.id, class_id=class_.id, day=days[i % len(days)],
+                                slot_number=i // len(days) + 1, start_time=time(8), end_time=time(9)))
+        db.commit()
+
+        return {
+            "headers": {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"},
+            "schedule_id": schedule.id,
+            "year": schedule.year,
+            "class_id": class_.id,
+        }
+    finally:
+        db.close()
+
+def count_queries(client: TestClient, url: str, headers: dict) -> int:
+    """Number of statements executed while serving one GET request"""
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert response.status_code == 200, f"{url}: {response.status_code} {response.text}"
+    return len(statements)
+
+def endpoints(user: dict) -> list:
+    return [
+        "/api/homework/",
+        "/api/homework/?slim=true",
+        "/api/homework/upcoming?days=30",
+        "/api/homework/overdue",
+        "/api/homework/buckets",
+        "/api/classes/",
+        f"/api/classes/{user['class_id']}/homework",
+        "/api/schedules/",
+        f"/api/schedules/{user['schedule_id']}",
+        f"/api/schedules/active/{user['year']}",
+        f"/api/schedules/{user['schedule_id']}/slots",
+        f"/api/schedules/{user['schedule_id']}/grid",
+        "/api/sync/changes",
+    ]
+
+def test_query_counts_do_not_grow_with_result_size():
+    client = TestClient(app)
+    small = seed_user("small@example.com", SMALL)
+    large = seed_user("large@example.com", LARGE)
+
+    for small_url, large_url in zip(endpoints(small), endpoints(large)):
+        small_count = count_queries(client, small_url, small["headers"])
+        large_count = count_queries(client, large_url, large["headers"])
+        print(f"   {large_url}: {small_count} queries for {SMALL} rows, {large_count} for {LARGE}")
+        assert small_count == large_count, f"{large_url} issues {large_count} queries for {LARGE} rows vs {small_count} for {SMALL}"
+
+if __name__ == "__main__":
+    print("🧪 Checking per-endpoint query counts")
+    print("=" * 40)
+    try:
+        test_query_counts_do_not_grow_with_result_size()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("\n🎉 Query counts are independent of result size")
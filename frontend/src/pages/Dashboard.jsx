@@ -25,17 +25,13 @@ function Dashboard() {
 
   const fetchDashboardData = async () => {
     try {
-      const [summaryRes, dueTodayRes, overdueRes, dueNextWeekRes] = await Promise.all([
-        dashboardAPI.getSummary(),
-        homeworkAPI.getDueToday(),
-        homeworkAPI.getOverdue(),
-        homeworkAPI.getDueNextWeek()
-      ])
+      // Summary and all three lists in one request
+      const { data } = await homeworkAPI.getBuckets(7)
       
-      setSummary(summaryRes.data)
-      setDueToday(dueTodayRes.data)
-      setOverdue(overdueRes.data)
-      setDueNextWeek(dueNextWeekRes.data)
+      setSummary(data.summary)
+      setDueToday(data.due_today)
+      setOverdue(data.overdue)
+      setDueNextWeek(data.upcoming)
     } catch (error) {
       console.error('Error fetching dashboard data:', error)
     } finally {
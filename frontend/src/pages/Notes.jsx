@@ -104,19 +104,43 @@ function Notes() {
     return levelValue || ''
   }
 
+  // Drive files are resolved in the background after a note is saved
+  const waitForDriveFile = async (noteId) => {
+    for (let attempt = 0; attempt < 30; attempt++) {
+      await new Promise(resolve => setTimeout(resolve, 1000))
+      try {
+        const response = await notesAPI.getDriveStatus(noteId)
+        if (response.data.drive_status !== 'PENDING') {
+          if (response.data.drive_status === 'FAILED') {
+            toast.error('Could not access the Google Drive file')
+          }
+          fetchNotes()
+          return
+        }
+      } catch (error) {
+        console.error('Error checking Google Drive file status:', error)
+        return
+      }
+    }
+  }
+
   const onSubmit = async (data) => {
     try {
+      let response
       if (editingNote) {
-        await notesAPI.update(editingNote.id, data)
+        response = await notesAPI.update(editingNote.id, data)
         toast.success('Note updated successfully')
       } else {
-        await notesAPI.create(data)
+        response = await notesAPI.create(data)
         toast.success('Note created successfully')
       }
       setShowModal(false)
       setEditingNote(null)
       reset()
       fetchNotes()
+      if (response.data.drive_status === 'PENDING') {
+        waitForDriveFile(response.data.id)
+      }
     } catch (error) {
       const errorMessage = error.response?.data?.detail || (editingNote ? 'Error updating note' : 'Error creating note')
       toast.error(errorMessage)
@@ -202,6 +226,9 @@ function Notes() {
               <p className="text-sm font-medium text-blue-900">
                 {note.google_drive_file_name || 'Google Drive File'}
               </p>
+              {note.drive_status === 'PENDING' && (
+                <p className="text-xs text-blue-600">Checking file…</p>
+              )}
               {note.google_drive_mime_type && (
                 <p className="text-xs text-blue-600">
                   {note.google_drive_mime_type.split('/')[1]?.toUpperCase() || 'Document'}
@@ -38,10 +38,14 @@ export const schedulesAPI = {
   delete: (id) => api.delete(`/api/schedules/${id}`),
   
   // Schedule slots
+  getNow: () => api.get('/api/schedules/now'),
+  getGrid: (scheduleId) => api.get(`/api/schedules/${scheduleId}/grid`),
   getSlots: (scheduleId) => api.get(`/api/schedules/${scheduleId}/slots`),
   createSlot: (scheduleId, data) => api.post(`/api/schedules/${scheduleId}/slots`, data),
   updateSlot: (scheduleId, slotId, data) => api.put(`/api/schedules/${scheduleId}/slots/${slotId}`, data),
   deleteSlot: (scheduleId, slotId) => api.delete(`/api/schedules/${scheduleId}/slots/${slotId}`),
+  replaceGrid: (scheduleId, slots) => api.put(`/api/schedules/${scheduleId}/grid`, { slots }),
+  validateGrid: (scheduleId, slots) => api.post(`/api/schedules/${scheduleId}/grid/validate`, { slots }),
 }
 
 // Homework API
@@ -52,10 +56,12 @@ export const homeworkAPI = {
   getOverdue: () => api.get('/api/homework/overdue'),
   getUpcoming: (days = 7) => api.get(`/api/homework/upcoming?days=${days}`),
   getDueNextWeek: () => api.get('/api/homework/upcoming?days=7'),
+  getBuckets: (days = 7) => api.get('/api/homework/buckets', { params: { days, slim: true } }),
   create: (data) => api.post('/api/homework/', data),
   update: (id, data) => api.put(`/api/homework/${id}`, data),
   complete: (id) => api.put(`/api/homework/${id}/complete`),
   reopen: (id) => api.put(`/api/homework/${id}/reopen`),
+  bulk: (operations) => api.post('/api/homework/bulk', { operations }),
   delete: (id) => api.delete(`/api/homework/${id}`),
 }
 
@@ -85,6 +91,12 @@ export const notesAPI = {
   attachDriveFile: (noteId, driveUrl) => api.post(`/api/notes/google-drive/attach?note_id=${noteId}&drive_url=${encodeURIComponent(driveUrl)}`),
   detachDriveFile: (noteId) => api.delete(`/api/notes/${noteId}/google-drive`),
   getDriveFileInfo: (fileId) => api.get(`/api/notes/google-drive/file-info/${fileId}`),
+  getDriveStatus: (noteId) => api.get(`/api/notes/${noteId}/drive-status`),
+}
+
+// Delta sync API
+export const syncAPI = {
+  getChanges: (since = 0, limit = 500) => api.get('/api/sync/changes', { params: { since, limit } }),
 }
 
 export default api
\ No newline at end of file